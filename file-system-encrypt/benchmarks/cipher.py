@@ -0,0 +1,77 @@
+import argparse
+import contextlib
+import os
+from pathlib import Path
+import sys
+import time
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from classes import cipher
+from classes.credentials import MappingProvider
+from classes.file_system import FileSystem
+
+KEY = bytes(range(32))
+
+
+def cipher_rate(block_size, total_bytes):
+    nonce = bytes(cipher.NONCE_SIZE)
+    data = os.urandom(block_size)
+    blocks = max(1, total_bytes // block_size)
+    start = time.perf_counter()
+    for index in range(blocks):
+        cipher.apply(KEY, nonce, index, 1, data)
+    return blocks * block_size / (time.perf_counter() - start) / 2**20
+
+
+def file_rates(block_size, file_size, protected):
+    fs = FileSystem(
+        -(-file_size // block_size),
+        block_size,
+        "pbkdf2",
+        {"iterations": 1_000},
+        credentials=MappingProvider({"/dados": "senha"}),
+    )
+    data = os.urandom(file_size)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        fs.create_directory("dados")
+        if protected:
+            fs.protect_directory("dados")
+        fs.change_directory("dados")
+        fs.create_file("arquivo", file_size)
+        start = time.perf_counter()
+        fs.write_file("arquivo", 0, data)
+        written = time.perf_counter() - start
+        start = time.perf_counter()
+        assert fs.read_file("arquivo") == data
+        read = time.perf_counter() - start
+    return file_size / written / 2**20, file_size / read / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Vazão da cifra por bloco em função do tamanho do bloco."
+    )
+    parser.add_argument(
+        "--block-sizes", type=int, nargs="+", default=[16, 64, 256, 1024, 4096, 16384]
+    )
+    parser.add_argument("--total-bytes", type=int, default=4 * 2**20)
+    parser.add_argument("--file-size", type=int, default=2**20)
+    config = parser.parse_args()
+
+    print(
+        f"{'Bloco':>7} {'cifra MB/s':>11} {'escrita MB/s':>13} {'leitura MB/s':>13} "
+        f"{'escrita s/ cifra':>17} {'leitura s/ cifra':>17}"
+    )
+    for block_size in config.block_sizes:
+        rate = cipher_rate(block_size, config.total_bytes)
+        write, read = file_rates(block_size, config.file_size, True)
+        plain_write, plain_read = file_rates(block_size, config.file_size, False)
+        print(
+            f"{block_size:>7} {rate:>11.1f} {write:>13.1f} {read:>13.1f} "
+            f"{plain_write:>17.1f} {plain_read:>17.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import argparse
+import contextlib
+import hashlib
+import os
+from pathlib import Path
+import sys
+import time
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from classes.credentials import MappingProvider
+from classes.directory import Directory
+from classes.file_system import FileSystem
+
+PASSWORD = "senha-de-teste"
+
+
+def time_check(kdf, params, repeat):
+    directory = Directory("protegido")
+    directory.set_password(PASSWORD, kdf, params)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        directory.check_password(PASSWORD)
+    return (time.perf_counter() - start) / repeat
+
+
+def time_cd(kdf, params, visits, unlock_ttl):
+    credentials = MappingProvider({"/protegido": PASSWORD})
+    fs = FileSystem(4, 4, kdf, params, unlock_ttl, credentials)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        fs.create_directory("protegido")
+        fs.protect_directory("protegido")
+        fs.change_directory("protegido")
+        fs.change_directory("..")
+        start = time.perf_counter()
+        for _ in range(visits):
+            fs.change_directory("protegido")
+            fs.change_directory("..")
+    return (time.perf_counter() - start) / visits
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Custo da derivação de senha e efeito do cache de desbloqueio."
+    )
+    parser.add_argument(
+        "--iterations", type=int, nargs="+", default=[10_000, 100_000, 600_000]
+    )
+    parser.add_argument(
+        "--scrypt-n", type=int, nargs="+", default=[2**12, 2**14, 2**15]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--visits", type=int, default=20, help="cds por medição")
+    parser.add_argument(
+        "--keyspace",
+        type=int,
+        default=26**6,
+        help="senhas candidatas de um ataque offline (padrão: 6 minúsculas)",
+    )
+    config = parser.parse_args()
+
+    settings = [("sha256 (antigo)", None, None)]
+    settings += [
+        (f"pbkdf2 i={iterations}", "pbkdf2", {"iterations": iterations})
+        for iterations in config.iterations
+    ]
+    settings += [
+        (f"scrypt n={n}", "scrypt", {"n": n, "r": 8, "p": 1}) for n in config.scrypt_n
+    ]
+
+    print(
+        f"{'KDF':<18} {'ms/senha':>9} {'tentativas/s':>13} {'ataque (dias)':>14} "
+        f"{'cd sem cache':>13} {'cd com cache':>13}"
+    )
+    for label, kdf, params in settings:
+        if kdf is None:
+            start = time.perf_counter()
+            for _ in range(10_000):
+                hashlib.sha256(PASSWORD.encode()).hexdigest()
+            seconds = (time.perf_counter() - start) / 10_000
+            uncached = cached = seconds
+        else:
+            seconds = time_check(kdf, params, config.repeat)
+            uncached = time_cd(kdf, params, config.visits, unlock_ttl=0)
+            cached = time_cd(kdf, params, config.visits, unlock_ttl=300)
+        days = config.keyspace * seconds / 86_400
+        print(
+            f"{label:<18} {seconds * 1e3:>9.3f} {1 / seconds:>13.0f} {days:>14.2f} "
+            f"{uncached * 1e3:>11.3f}ms {cached * 1e3:>11.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
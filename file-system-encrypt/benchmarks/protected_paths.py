@@ -0,0 +1,72 @@
+import argparse
+import contextlib
+import os
+from pathlib import Path
+import sys
+import time
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from classes.credentials import CallbackProvider
+from classes.file_system import FileSystem
+
+
+def traverse(config, protected, unlock_ttl):
+    requests = []
+    passwords = {}
+
+    def credentials(path, purpose):
+        requests.append(path)
+        return passwords[path]
+
+    fs = FileSystem(
+        4,
+        4,
+        "pbkdf2",
+        {"iterations": config.iterations},
+        unlock_ttl,
+        CallbackProvider(credentials),
+    )
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for level in range(config.depth):
+            name = f"p{level}"
+            fs.create_directory(name)
+            if protected:
+                passwords[fs.current_directory.subdirectories[name].get_path()] = name
+                fs.protect_directory(name)
+            fs.change_directory(name)
+        for _ in range(config.depth):
+            fs.change_directory("..")
+        requests.clear()
+
+        start = time.perf_counter()
+        for _ in range(config.rounds):
+            for level in range(config.depth):
+                fs.change_directory(f"p{level}")
+            for _ in range(config.depth):
+                fs.change_directory("..")
+        elapsed = time.perf_counter() - start
+    return 2 * config.depth * config.rounds / elapsed, len(requests)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Percorre árvores protegidas usando um provedor de senhas."
+    )
+    parser.add_argument("--depth", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=10_000)
+    config = parser.parse_args()
+
+    print(f"{'Árvore':<28} {'cd/s':>10} {'senhas pedidas':>15}")
+    for label, protected, unlock_ttl in (
+        ("sem proteção", False, 300),
+        ("protegida, sem cache", True, 0),
+        ("protegida, com cache", True, 300),
+    ):
+        rate, requests = traverse(config, protected, unlock_ttl)
+        print(f"{label:<28} {rate:>10.0f} {requests:>15}")
+
+
+if __name__ == "__main__":
+    main()
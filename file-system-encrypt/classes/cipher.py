@@ -0,0 +1,27 @@
+import hashlib
+
+DIGEST_SIZE = hashlib.sha256().digest_size
+NONCE_SIZE = 16
+
+
+# Cifra de fluxo em modo contador sobre SHA-256. O fluxo de um bloco é
+# SHA-256(chave | nonce do arquivo | índice do bloco | geração | contador),
+# então ler ou reescrever um bloco não exige tocar nos demais. A geração do
+# bloco avança a cada reescrita para que o mesmo fluxo nunca cifre dois
+# conteúdos diferentes.
+def keystream(key, nonce, index, generation, length):
+    prefix = hashlib.sha256(
+        key + nonce + index.to_bytes(8, "little") + generation.to_bytes(8, "little")
+    )
+    chunks = []
+    for counter in range(-(-length // DIGEST_SIZE)):
+        digest = prefix.copy()
+        digest.update(counter.to_bytes(4, "little"))
+        chunks.append(digest.digest())
+    return b"".join(chunks)[:length]
+
+
+def apply(key, nonce, index, generation, data):
+    stream = keystream(key, nonce, index, generation, len(data))
+    mixed = int.from_bytes(data, "little") ^ int.from_bytes(stream, "little")
+    return mixed.to_bytes(len(data), "little")
@@ -0,0 +1,47 @@
+import json
+import os
+
+
+# Fontes de senha dos diretórios protegidos. O FileSystem pede a senha com
+# password_for(caminho, finalidade), em que a finalidade é "unlock" (cd) ou
+# "protect"; None significa que a fonte não conhece a senha.
+class CredentialProvider:
+    def password_for(self, path, purpose):
+        raise NotImplementedError
+
+
+class InteractiveProvider(CredentialProvider):
+    def password_for(self, path, purpose):
+        name = path.rstrip("/").rsplit("/", 1)[-1]
+        if purpose == "protect":
+            return input(f"Digite a senha para proteger '{name}': ")
+        return input(f"Digite a senha para '{name}': ")
+
+
+class CallbackProvider(CredentialProvider):
+    def __init__(self, callback):
+        self.callback = callback
+
+    def password_for(self, path, purpose):
+        return self.callback(path, purpose)
+
+
+class MappingProvider(CredentialProvider):
+    def __init__(self, passwords):
+        self.passwords = passwords
+
+    def password_for(self, path, purpose):
+        return self.passwords.get(path)
+
+
+# Chaveiro em arquivo JSON no formato {"/caminho": "senha"}.
+class KeyringProvider(MappingProvider):
+    def __init__(self, path):
+        with open(path) as keyring:
+            super().__init__(json.load(keyring))
+
+
+# Mesmo formato do chaveiro, lido de uma variável de ambiente.
+class EnvironmentProvider(MappingProvider):
+    def __init__(self, variable="FS_PASSWORDS", environ=os.environ):
+        super().__init__(json.loads(environ.get(variable, "{}")))
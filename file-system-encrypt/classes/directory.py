@@ -1,4 +1,6 @@
-import hashlib
+import hmac
+
+from classes.kdf import DEFAULT_PARAMS, derive_key, new_salt, split_key
 
 
 class Directory:
@@ -9,17 +11,32 @@ class Directory:
         self.subdirectories = {}
         self.is_protected = False
         self.password_hash = None
+        self.salt = None
+        self.kdf = None
+        self.kdf_params = None
 
     def get_path(self):
         if self.parent is None:
             return "/"
         return f"{self.parent.get_path()}/{self.name}".replace("//", "/")
 
-    def set_password(self, password):
+    def set_password(self, password, kdf="pbkdf2", params=None):
         self.is_protected = True
-        self.password_hash = hashlib.sha256(password.encode()).hexdigest()
+        self.salt = new_salt()
+        self.kdf = kdf
+        self.kdf_params = dict(params or DEFAULT_PARAMS[kdf])
+        master = derive_key(password, self.salt, kdf, self.kdf_params)
+        self.password_hash, content_key = split_key(master)
+        return content_key
+
+    def unlock(self, password):
+        master = derive_key(password, self.salt, self.kdf, self.kdf_params)
+        verifier, content_key = split_key(master)
+        if not hmac.compare_digest(verifier, self.password_hash):
+            return None
+        return content_key
 
     def check_password(self, password):
         if not self.is_protected:
             return True
-        return hashlib.sha256(password.encode()).hexdigest() == self.password_hash
+        return self.unlock(password) is not None
@@ -1,5 +1,12 @@
+import os
+
+from classes.cipher import NONCE_SIZE
+
+
 class File:
     def __init__(self, name, size):
         self.name = name
         self.size = size
         self.blocks = []
+        self.nonce = os.urandom(NONCE_SIZE)
+        self.generations = []
@@ -1,22 +1,45 @@
 import math
 import os
 import random
+import time
 
+from classes import cipher
+from classes.credentials import InteractiveProvider
 from classes.directory import Directory
 from classes.file import File
 
 
 class FileSystem:
-    def __init__(self, total_blocks, block_size):
+    def __init__(
+        self,
+        total_blocks,
+        block_size,
+        kdf="pbkdf2",
+        kdf_params=None,
+        unlock_ttl=300,
+        credentials=None,
+    ):
         self.total_blocks = total_blocks
         self.block_size = block_size
         self.memory = [{} for _ in range(total_blocks)]
         self.block_links = [-1] * total_blocks
         self.root = Directory("/")
         self.current_directory = self.root
+        self.kdf = kdf
+        self.kdf_params = kdf_params
+        # Diretórios já desbloqueados nesta sessão, com o instante em que a
+        # senha volta a ser pedida. Evita refazer a derivação lenta a cada cd.
+        self.unlock_ttl = unlock_ttl
+        self.unlocked = {}
+        self.credentials = credentials or InteractiveProvider()
+        # Conteúdo dos blocos (cifrado nos diretórios protegidos) e chaves de
+        # conteúdo já derivadas nesta sessão, por diretório protegido.
+        self.contents = {}
+        self.keys = {}
 
     def allocate_blocks(self, file):
-        required_blocks = math.ceil(file.size / self.block_size)
+        first_new = len(file.blocks)
+        required_blocks = math.ceil(file.size / self.block_size) - first_new
         free_blocks = [i for i, block in enumerate(self.memory) if not block]
 
         if len(free_blocks) < required_blocks:
@@ -26,13 +49,15 @@ class FileSystem:
         allocated = random.sample(free_blocks, required_blocks)
         allocated.sort()
 
-        for i in range(len(allocated) - 1):
-            self.block_links[allocated[i]] = allocated[i + 1]
+        chain = file.blocks[-1:] + allocated
+        for i in range(len(chain) - 1):
+            self.block_links[chain[i]] = chain[i + 1]
 
-        for block in allocated:
-            self.memory[block][file.name] = min(self.block_size, file.size)
-            file.size -= self.block_size
-            file.blocks.append(block)
+        file.blocks.extend(allocated)
+        file.generations.extend([0] * len(allocated))
+        for i in range(max(first_new - 1, 0), len(file.blocks)):
+            used = min(self.block_size, file.size - i * self.block_size)
+            self.memory[file.blocks[i]][file.name] = used
 
         return True
 
@@ -58,6 +83,7 @@ class FileSystem:
         for block in file.blocks:
             del self.memory[block][name]
             self.block_links[block] = -1
+            self.contents.pop(block, None)
 
         del self.current_directory.files[name]
         print(f"Arquivo '{name}' removido.")
@@ -108,9 +134,16 @@ class FileSystem:
                 self.current_directory = self.current_directory.parent
         elif name in self.current_directory.subdirectories:
             target_dir = self.current_directory.subdirectories[name]
-            if target_dir.is_protected:
-                password = input(f"Digite a senha para '{name}': ")
-                if target_dir.check_password(password):
+            if target_dir.is_protected and not self.is_unlocked(target_dir):
+                password = self.credentials.password_for(
+                    target_dir.get_path(), "unlock"
+                )
+                key = None if password is None else target_dir.unlock(password)
+                if password is None:
+                    print("Erro: Senha não fornecida!")
+                elif key is not None:
+                    self.keys[target_dir] = key
+                    self.unlocked[target_dir] = time.monotonic() + self.unlock_ttl
                     self.current_directory = target_dir
                     print(f"Entrando em '{name}'")
                 else:
@@ -126,10 +159,163 @@ class FileSystem:
             return
 
         directory = self.current_directory.subdirectories[name]
-        password = input(f"Digite a senha para proteger '{name}': ")
-        directory.set_password(password)
+        # Os arquivos que passam a depender da nova chave são decifrados com
+        # a chave anterior (do próprio diretório ou de um ancestral) e
+        # cifrados de novo depois de trocar a senha.
+        old_key = self._key_for(directory)
+        if old_key is False:
+            return
+        password = self.credentials.password_for(directory.get_path(), "protect")
+        if password is None:
+            print("Erro: Senha não fornecida!")
+            return
+        files = self._files_keyed_by(directory)
+        plaintexts = [
+            [self._load_block(file, i, old_key) for i in range(len(file.blocks))]
+            for file in files
+        ]
+
+        key = directory.set_password(password, self.kdf, self.kdf_params)
+        self.keys.pop(directory, None)
+        self.unlocked.pop(directory, None)
+        for file, blocks in zip(files, plaintexts):
+            for index, data in enumerate(blocks):
+                self._store_block(file, index, data, key)
         print(f"Diretório '{name}' agora está protegido com senha.")
 
+    def _protector(self, directory):
+        while directory is not None and not directory.is_protected:
+            directory = directory.parent
+        return directory
+
+    def _key_for(self, directory):
+        protector = self._protector(directory)
+        if protector is None:
+            return None
+        # A chave só fica guardada enquanto o desbloqueio vale: depois do
+        # TTL a senha é pedida de novo, inclusive para trocar a senha.
+        if not self.is_unlocked(protector):
+            password = self.credentials.password_for(protector.get_path(), "unlock")
+            if password is None:
+                print("Erro: Senha não fornecida!")
+                return False
+            key = protector.unlock(password)
+            if key is None:
+                print("Erro: Senha incorreta!")
+                return False
+            self.keys[protector] = key
+            self.unlocked[protector] = time.monotonic() + self.unlock_ttl
+        return self.keys[protector]
+
+    def _files_keyed_by(self, directory):
+        files = []
+        pending = [directory]
+        while pending:
+            current = pending.pop()
+            files.extend(current.files.values())
+            pending.extend(
+                subdirectory
+                for subdirectory in current.subdirectories.values()
+                if not subdirectory.is_protected
+            )
+        return files
+
+    def _load_block(self, file, index, key):
+        data = self.contents.get(file.blocks[index])
+        if data is None:
+            return bytes(self.block_size)
+        if key is None:
+            return data
+        return cipher.apply(key, file.nonce, index, file.generations[index], data)
+
+    def _store_block(self, file, index, data, key):
+        if key is not None:
+            file.generations[index] += 1
+            data = cipher.apply(key, file.nonce, index, file.generations[index], data)
+        self.contents[file.blocks[index]] = data
+
+    def _find_file(self, name):
+        if name not in self.current_directory.files:
+            print("Erro: Arquivo não encontrado!")
+            return None
+        return self.current_directory.files[name]
+
+    def write_file(self, name, offset, data):
+        file = self._find_file(name)
+        if file is None:
+            return False
+        key = self._key_for(self.current_directory)
+        if key is False:
+            return False
+
+        end = offset + len(data)
+        if end > file.size:
+            old_size = file.size
+            file.size = end
+            if not self.allocate_blocks(file):
+                file.size = old_size
+                return False
+
+        # Só os blocos tocados pela escrita são decifrados e cifrados de novo.
+        position = offset
+        while position < end:
+            index, block_offset = divmod(position, self.block_size)
+            length = min(self.block_size - block_offset, end - position)
+            chunk = data[position - offset : position - offset + length]
+            if length == self.block_size:
+                block = chunk
+            else:
+                block = bytearray(self._load_block(file, index, key))
+                block[block_offset : block_offset + length] = chunk
+            self._store_block(file, index, bytes(block), key)
+            position += length
+        return True
+
+    def append_file(self, name, data):
+        file = self._find_file(name)
+        if file is None:
+            return False
+        return self.write_file(name, file.size, data)
+
+    def read_file(self, name, offset=0, length=None):
+        file = self._find_file(name)
+        if file is None:
+            return None
+        key = self._key_for(self.current_directory)
+        if key is False:
+            return None
+
+        end = file.size if length is None else min(file.size, offset + length)
+        chunks = []
+        position = offset
+        while position < end:
+            index, block_offset = divmod(position, self.block_size)
+            chunk_length = min(self.block_size - block_offset, end - position)
+            block = self._load_block(file, index, key)
+            chunks.append(block[block_offset : block_offset + chunk_length])
+            position += chunk_length
+        return b"".join(chunks)
+
+    def show_file(self, name, offset=0, length=None):
+        data = self.read_file(name, offset, length)
+        if data is not None:
+            print(data.decode(errors="replace"))
+
+    def is_unlocked(self, directory):
+        expires = self.unlocked.get(directory)
+        if expires is None:
+            return False
+        if time.monotonic() >= expires:
+            del self.unlocked[directory]
+            self.keys.pop(directory, None)
+            return False
+        return True
+
+    def lock_directories(self):
+        self.unlocked.clear()
+        self.keys.clear()
+        print("Diretórios protegidos bloqueados novamente.")
+
     def clear_screen(self):
         os.system("cls" if os.name == "nt" else "clear")
 
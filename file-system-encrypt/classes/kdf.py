@@ -0,0 +1,46 @@
+import hashlib
+import hmac
+import os
+
+SALT_SIZE = 16
+KEY_SIZE = 32
+
+# Custos padrão: cerca de 0,1 a 0,3 s por verificação em uma CPU atual, o
+# que limita um ataque offline a poucas tentativas por segundo por núcleo.
+DEFAULT_PARAMS = {
+    "pbkdf2": {"iterations": 600_000},
+    "scrypt": {"n": 2**15, "r": 8, "p": 1},
+}
+
+
+def new_salt():
+    return os.urandom(SALT_SIZE)
+
+
+def derive_key(password, salt, kdf="pbkdf2", params=None, length=KEY_SIZE):
+    params = params or DEFAULT_PARAMS[kdf]
+    if kdf == "pbkdf2":
+        return hashlib.pbkdf2_hmac(
+            "sha256", password.encode(), salt, params["iterations"], length
+        )
+    if kdf == "scrypt":
+        n, r, p = params["n"], params["r"], params["p"]
+        return hashlib.scrypt(
+            password.encode(),
+            salt=salt,
+            n=n,
+            r=r,
+            p=p,
+            maxmem=256 * n * r + (1 << 20),
+            dklen=length,
+        )
+    raise ValueError(f"KDF desconhecida: {kdf}")
+
+
+# Uma única derivação lenta gera a chave mestra; dela saem, por HMAC, o
+# verificador guardado no diretório e a chave que cifra o conteúdo, que
+# nunca é armazenada.
+def split_key(master):
+    verifier = hmac.new(master, b"verificador", hashlib.sha256).digest()
+    content_key = hmac.new(master, b"conteudo", hashlib.sha256).digest()
+    return verifier, content_key
@@ -1,46 +1,198 @@
+import argparse
+import contextlib
+import os
+import sys
+import time
+from collections import defaultdict
+
+from classes.credentials import EnvironmentProvider, KeyringProvider, MappingProvider
 from classes.file_system import FileSystem
+from classes.kdf import DEFAULT_PARAMS
+
+
+def execute(fs, command):
+    cmd = command[0]
+    args = command[1:]
+
+    if cmd == "mkdir" and args:
+        fs.create_directory(args[0])
+    elif cmd == "rmdir" and args:
+        fs.delete_directory(args[0])
+    elif cmd == "touch" and len(args) == 2:
+        fs.create_file(args[0], int(args[1]))
+    elif cmd == "rm" and args:
+        fs.delete_file(args[0])
+    elif cmd == "write" and len(args) >= 3:
+        fs.write_file(args[0], int(args[1]), " ".join(args[2:]).encode())
+    elif cmd == "append" and len(args) >= 2:
+        fs.append_file(args[0], " ".join(args[1:]).encode())
+    elif cmd == "cat" and args:
+        fs.show_file(args[0], *map(int, args[1:3]))
+    elif cmd == "ls":
+        fs.list_directory()
+    elif cmd == "alloc":
+        fs.show_allocation()
+    elif cmd == "cd" and args:
+        fs.change_directory(args[0])
+    elif cmd == "protect" and args:
+        fs.protect_directory(args[0])
+    elif cmd == "lock":
+        fs.lock_directories()
+    elif cmd == "clear":
+        fs.clear_screen()
+    elif cmd == "tree":
+        fs.show_tree()
+    elif cmd == "exit":
+        return False
+    else:
+        print("Comando não reconhecido.")
+        print(
+            "Comandos disponíveis: mkdir, rmdir, touch, rm, write, append, cat, ls, "
+            "alloc, cd, protect, lock, clear, tree, exit"
+        )
+    return True
+
+
+def percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+def print_summary(latencies, elapsed, errors=0):
+    total = sum(len(samples) for samples in latencies.values())
+    rate = total / elapsed if elapsed else float("inf")
+    print(f"\n{total} operações em {elapsed:.3f}s ({rate:.0f} ops/s)")
+    if errors:
+        print(f"{errors} linha(s) com argumentos inválidos ignorada(s)")
+    print(
+        f"{'Comando':<10} {'Qtd':>9} {'p50 (µs)':>10} {'p90 (µs)':>10} "
+        f"{'p99 (µs)':>10} {'máx (µs)':>10}"
+    )
+    for cmd, samples in sorted(latencies.items()):
+        samples.sort()
+        print(
+            f"{cmd:<10} {len(samples):>9} "
+            f"{percentile(samples, 0.5) * 1e6:>10.1f} "
+            f"{percentile(samples, 0.9) * 1e6:>10.1f} "
+            f"{percentile(samples, 0.99) * 1e6:>10.1f} "
+            f"{samples[-1] * 1e6:>10.1f}"
+        )
+
+
+def run_script(fs, lines, quiet):
+    latencies = defaultdict(list)
+    errors = 0
+    if quiet:
+        output = open(os.devnull, "w")
+    else:
+        output = open(sys.stdout.fileno(), "w", buffering=1 << 20, closefd=False)
+
+    start = time.perf_counter()
+    with output, contextlib.redirect_stdout(output):
+        for number, line in enumerate(lines, 1):
+            command = line.split()
+            if not command or command[0].startswith("#"):
+                continue
+            before = time.perf_counter()
+            # Um argumento numérico inválido descarta só a linha, e não o
+            # resto de um trace longo.
+            try:
+                running = execute(fs, command)
+            except ValueError:
+                errors += 1
+                print(f"Erro: Argumento inválido na linha {number}: {line.strip()}")
+                continue
+            latencies[command[0]].append(time.perf_counter() - before)
+            if not running:
+                break
+    elapsed = time.perf_counter() - start
+
+    print_summary(latencies, elapsed, errors)
 
 
 def main():
+    parser = argparse.ArgumentParser(
+        description="Simulador de sistema de arquivos com diretórios protegidos"
+    )
+    parser.add_argument(
+        "--script", help="arquivo de comandos para executar em lote ('-' para stdin)"
+    )
+    parser.add_argument(
+        "--quiet", action="store_true", help="descarta a saída dos comandos em lote"
+    )
+    parser.add_argument(
+        "--kdf",
+        choices=list(DEFAULT_PARAMS),
+        default="pbkdf2",
+        help="função de derivação da senha",
+    )
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=DEFAULT_PARAMS["pbkdf2"]["iterations"],
+        help="iterações do PBKDF2",
+    )
+    parser.add_argument(
+        "--scrypt-n",
+        type=int,
+        default=DEFAULT_PARAMS["scrypt"]["n"],
+        help="fator de custo N do scrypt",
+    )
+    parser.add_argument(
+        "--unlock-ttl",
+        type=float,
+        default=300,
+        help="segundos em que um diretório desbloqueado dispensa a senha",
+    )
+    parser.add_argument(
+        "--keyring", help='arquivo JSON {"/caminho": "senha"} com as senhas'
+    )
+    parser.add_argument(
+        "--password-env",
+        metavar="VARIÁVEL",
+        help="variável de ambiente com o mapa JSON de senhas",
+    )
+    options = parser.parse_args()
+
+    if options.kdf == "pbkdf2":
+        kdf_params = {"iterations": options.iterations}
+    else:
+        kdf_params = {**DEFAULT_PARAMS["scrypt"], "n": options.scrypt_n}
+
+    credentials = None
+    if options.keyring is not None:
+        credentials = KeyringProvider(options.keyring)
+    elif options.password_env is not None:
+        credentials = EnvironmentProvider(options.password_env)
+    elif options.script is not None:
+        # Em lote não há a quem perguntar: input() consumiria a próxima linha
+        # do script como senha. Sem chaveiro, as senhas não são fornecidas.
+        credentials = MappingProvider({})
+
     total_blocks = 20
     block_size = 4
-    fs = FileSystem(total_blocks, block_size)
+    fs = FileSystem(
+        total_blocks,
+        block_size,
+        options.kdf,
+        kdf_params,
+        options.unlock_ttl,
+        credentials,
+    )
+
+    if options.script is not None:
+        if options.script == "-":
+            run_script(fs, sys.stdin, options.quiet)
+        else:
+            with open(options.script) as script:
+                run_script(fs, script, options.quiet)
+        return
 
     while True:
         command = input(f"{fs.current_directory.get_path()} $ ").strip().split()
         if not command:
             continue
-
-        cmd = command[0]
-        args = command[1:]
-
-        if cmd == "mkdir" and args:
-            fs.create_directory(args[0])
-        elif cmd == "rmdir" and args:
-            fs.delete_directory(args[0])
-        elif cmd == "touch" and len(args) == 2:
-            fs.create_file(args[0], int(args[1]))
-        elif cmd == "rm" and args:
-            fs.delete_file(args[0])
-        elif cmd == "ls":
-            fs.list_directory()
-        elif cmd == "alloc":
-            fs.show_allocation()
-        elif cmd == "cd" and args:
-            fs.change_directory(args[0])
-        elif cmd == "protect" and args:
-            fs.protect_directory(args[0])
-        elif cmd == "clear":
-            fs.clear_screen()
-        elif cmd == "tree":
-            fs.show_tree()
-        elif cmd == "exit":
+        if not execute(fs, command):
             break
-        else:
-            print("Comando não reconhecido.")
-            print(
-                "Comandos disponíveis: mkdir, rmdir, touch, rm, ls, alloc, cd, protect, clear, tree, exit"
-            )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,164 @@
+import argparse
+import contextlib
+import os
+from pathlib import Path
+import random
+import sys
+import threading
+import time
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from classes.block_store import FREE
+from classes.file import File
+from classes.file_system import FileSystem
+from classes.session import Session
+
+SHARED_DIRECTORIES = 4
+
+
+def worker(fs, index, config, errors):
+    session = Session(fs)
+    session.create_directory(f"/t{index}")
+    session.change_directory(f"/t{index}")
+    rng = random.Random(config.seed * 1000 + index)
+    files = {}
+
+    for i in range(config.operations):
+        choice = rng.random()
+        if not files or choice < 0.25:
+            if rng.random() < 0.5:
+                path = f"f{i}"
+            else:
+                path = f"/shared{rng.randrange(SHARED_DIRECTORIES)}/t{index}_{i}"
+            data = bytes([index % 256]) * rng.randint(1, 4 * config.block_size)
+            session.create_file(path, len(data))
+            if session.write_file(path, 0, data):
+                files[path] = data
+        elif choice < 0.45:
+            path = rng.choice(list(files))
+            data = bytes([i % 256]) * rng.randint(1, config.block_size)
+            if session.append_file(path, data):
+                files[path] += data
+        elif choice < 0.6:
+            path = rng.choice(list(files))
+            offset = rng.randrange(len(files[path]))
+            data = bytes([(i + 1) % 256]) * (len(files[path]) - offset)
+            session.write_file(path, offset, data)
+            files[path] = files[path][:offset] + data
+        elif choice < 0.75:
+            path = rng.choice(list(files))
+            if session.read_file(path) != files[path]:
+                errors.append(f"thread {index}: conteúdo divergente em {path}")
+        elif choice < 0.85:
+            path = rng.choice(list(files))
+            del files[path]
+            session.delete_file(path)
+        elif choice < 0.93:
+            # Nomes prefixados pela thread não colidem nos diretórios
+            # compartilhados.
+            source = rng.choice(list(files))
+            name = source.rsplit("/", 1)[-1]
+            if source.startswith("/"):
+                target = name
+            else:
+                shared = rng.randrange(SHARED_DIRECTORIES)
+                target = f"/shared{shared}/t{index}_{name}"
+            session.move(source, target)
+            files[target] = files.pop(source)
+        elif choice < 0.99:
+            shared = f"/shared{rng.randrange(SHARED_DIRECTORIES)}"
+            for entry in session.list_entries(shared, pattern="*"):
+                if not entry.endswith("/") and not entry.startswith("t"):
+                    errors.append(f"thread {index}: entrada inesperada {entry}")
+        else:
+            session.defragment(config.defrag_budget)
+
+    for path, data in files.items():
+        if session.read_file(path) != data:
+            errors.append(f"thread {index}: conteúdo final divergente em {path}")
+    return files
+
+
+def check_invariants(fs):
+    problems = []
+    files = [node for _, node in fs.walk() if isinstance(node, File)]
+    if {file.id for file in files} != set(fs.files_by_id):
+        problems.append("arquivos da árvore diferem de files_by_id")
+
+    owned = {}
+    for file in files:
+        for block in fs._layout(file):
+            if block in owned:
+                problems.append(f"bloco {block} pertence a dois arquivos")
+            owned[block] = file.id
+            if fs.store.owners[block] != file.id:
+                problems.append(f"bloco {block} com dono errado")
+
+    for block in range(fs.total_blocks):
+        free = fs.store.owners[block] == FREE
+        if free != fs.free_space.is_free(block):
+            problems.append(f"bloco {block} diverge do mapa de espaço livre")
+        if not free and block not in owned:
+            problems.append(f"bloco {block} ocupado sem arquivo")
+    if sum(length for _, length in fs.free_space.runs()) != fs.free_space.free_count:
+        problems.append("trechos livres não somam free_count")
+    return problems
+
+
+def run(config, threads):
+    fs = FileSystem(
+        config.total_blocks, config.block_size, config.strategy, seed=config.seed
+    )
+    errors = []
+    workers = [
+        threading.Thread(target=worker, args=(fs, index, config, errors))
+        for index in range(threads)
+    ]
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for i in range(SHARED_DIRECTORIES):
+            fs.create_directory(f"/shared{i}")
+        start = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - start
+    return elapsed, errors + check_invariants(fs)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Teste de estresse e escalabilidade com sessões concorrentes."
+    )
+    parser.add_argument("--total-blocks", type=int, default=200_000)
+    parser.add_argument("--block-size", type=int, default=64)
+    parser.add_argument("--strategy", default="linked")
+    parser.add_argument(
+        "--operations", type=int, default=2_000, help="operações por thread"
+    )
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--defrag-budget", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=42)
+    config = parser.parse_args()
+
+    print(f"{'Threads':>7} {'Tempo (s)':>10} {'ops/s':>10} {'Escala':>7} Invariantes")
+    baseline = None
+    failed = False
+    for threads in config.threads:
+        elapsed, problems = run(config, threads)
+        rate = threads * config.operations / elapsed
+        baseline = baseline or rate
+        status = "ok" if not problems else f"{len(problems)} falhas"
+        print(
+            f"{threads:>7} {elapsed:>10.3f} {rate:>10.0f} "
+            f"{rate / baseline:>6.2f}x {status}"
+        )
+        for problem in problems[:10]:
+            print(f"  {problem}")
+        failed = failed or bool(problems)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import argparse
+import contextlib
+import multiprocessing
+import os
+from pathlib import Path
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from classes.file_system import FileSystem
+from classes.journal import Journal, replay
+
+
+def operations(rng, count, block_size):
+    live = []
+    for i in range(count):
+        choice = rng.random()
+        if live and choice < 0.3:
+            yield "delete_file", live.pop(rng.randrange(len(live)))
+        elif live and choice < 0.6:
+            data = bytes(rng.randrange(256) for _ in range(block_size))
+            yield "append_file", rng.choice(live), data
+        elif choice < 0.65:
+            yield "create_directory", f"/d{i}"
+        else:
+            live.append(f"/f{i}")
+            yield "create_file", live[-1], rng.randint(1, 4 * block_size)
+
+
+def run(config, directory, group_size):
+    fs = FileSystem(config.total_blocks, config.block_size, seed=config.seed)
+    journal = None
+    if group_size is not None:
+        path = os.path.join(directory, f"journal-{group_size}.log")
+        journal = Journal(path, fs.journal_header(), group_size, config.group_delay)
+        fs.attach_journal(journal)
+
+    rng = random.Random(config.seed)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        for method, *args in operations(rng, config.operations, config.block_size):
+            getattr(fs, method)(*args)
+        fs.sync()
+        elapsed = time.perf_counter() - start
+    if journal is None:
+        return fs, elapsed, 0, None
+    fs.unmount()
+    return fs, elapsed, journal.commits, journal.path
+
+
+def check_replay(config, path):
+    header, records = Journal.read(path)
+    fs = FileSystem(header["total_blocks"], header["block_size"])
+    fs.restore_rng(header)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        replay(fs, records)
+    fs.sync()
+    return fs
+
+
+def crash(config, image_path, journal_path, during_sync):
+    # Metade das operações vai para a imagem num sync; a outra metade fica só
+    # no journal, e o processo morre sem desmontar ou, com during_sync, no
+    # sync seguinte, depois de gravar tabelas e namespace e antes de trocar
+    # o superbloco.
+    fs = FileSystem.format(image_path, config.total_blocks, config.block_size)
+    fs.rng.seed(config.seed)
+    fs.attach_journal(Journal(journal_path, fs.journal_header(), 64))
+    rng = random.Random(config.seed)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for i, (method, *args) in enumerate(
+            operations(rng, config.operations, config.block_size)
+        ):
+            if i == config.operations // 2:
+                fs.sync()
+            getattr(fs, method)(*args)
+    fs.journal.commit()
+    if during_sync:
+        fs.image._switch = lambda *args: os._exit(0)
+        fs.sync()
+    os._exit(0)
+
+
+def check_image_replay(config, directory, expected, during_sync):
+    image_path = os.path.join(directory, f"disco-{during_sync}.img")
+    journal_path = os.path.join(directory, f"journal-imagem-{during_sync}.log")
+    process = multiprocessing.Process(
+        target=crash, args=(config, image_path, journal_path, during_sync)
+    )
+    process.start()
+    process.join()
+
+    fs = FileSystem.mount(image_path)
+    header, records = Journal.read(journal_path)
+    fs.restore_rng(header)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        replay(fs, records)
+    fs.sync()
+    return fs.store.owners.tolist() == expected.store.owners.tolist() and all(
+        fs.store.read_block(block) == expected.store.read_block(block)
+        for block in range(config.total_blocks)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara o custo do journal com fsync por operação e em grupo."
+    )
+    parser.add_argument("--total-blocks", type=int, default=20_000)
+    parser.add_argument("--block-size", type=int, default=64)
+    parser.add_argument("--operations", type=int, default=2_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--group-sizes", type=int, nargs="+", default=[1, 16, 64, 256]
+    )
+    parser.add_argument("--group-delay", type=float, default=0.05)
+    config = parser.parse_args()
+
+    print(f"{'Journal':<16} {'Tempo (s)':>10} {'ops/s':>10} {'fsyncs':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        expected, path = None, None
+        for group_size in [None, *config.group_sizes]:
+            fs, elapsed, commits, journal_path = run(config, directory, group_size)
+            label = "sem journal" if group_size is None else f"grupo de {group_size}"
+            print(
+                f"{label:<16} {elapsed:>10.3f} "
+                f"{config.operations / elapsed:>10.0f} {commits:>8}"
+            )
+            if group_size is None:
+                expected = fs
+            elif path is None:
+                path = journal_path
+
+        replayed = check_replay(config, path)
+        identical = (
+            replayed.store.owners == expected.store.owners
+            and replayed.store.contents == expected.store.contents
+        )
+        answer = "sim" if identical else "não"
+        print(f"Repetição do journal reproduz o estado: {answer}")
+        for label, during_sync in (("depois do sync", False), ("durante o sync", True)):
+            identical = check_image_replay(config, directory, expected, during_sync)
+            answer = "sim" if identical else "não"
+            print(f"Queda com imagem {label} + repetição reproduz o estado: {answer}")
+
+
+if __name__ == "__main__":
+    main()
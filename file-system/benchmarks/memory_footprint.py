@@ -0,0 +1,58 @@
+import argparse
+from pathlib import Path
+import sys
+import tracemalloc
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from classes.block_store import BlockStore
+
+
+def measure(build):
+    tracemalloc.start()
+    structure = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del structure
+    return current
+
+
+def list_of_dicts(total_blocks, file_blocks):
+    memory = [{} for _ in range(total_blocks)]
+    block_links = [-1] * total_blocks
+    for block in range(total_blocks):
+        memory[block][f"arquivo_{block // file_blocks}"] = 4
+        block_links[block] = block + 1 if (block + 1) % file_blocks else -1
+    return memory, block_links
+
+
+def array_store(total_blocks, file_blocks):
+    store = BlockStore(total_blocks, 4)
+    for block in range(total_blocks):
+        store.assign(block, block // file_blocks, 4)
+        store.links[block] = block + 1 if (block + 1) % file_blocks else -1
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara a memória da tabela de blocos antiga com o BlockStore."
+    )
+    parser.add_argument(
+        "--blocks", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--file-blocks", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{'Blocos':>12} {'lista de dicts':>16} {'BlockStore':>12} {'Redução':>9}")
+    for total_blocks in args.blocks:
+        old = measure(lambda: list_of_dicts(total_blocks, args.file_blocks))
+        new = measure(lambda: array_store(total_blocks, args.file_blocks))
+        print(
+            f"{total_blocks:>12} {old / 2**20:>14.1f}MB {new / 2**20:>10.1f}MB "
+            f"{old / new:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import argparse
+import contextlib
+import json
+import os
+from pathlib import Path
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from classes.file_system import FileSystem
+
+OPERATIONS = {
+    "create": lambda fs, path, size: fs.create_file(path, size),
+    "delete": lambda fs, path: fs.delete_file(path),
+    "mkdir": lambda fs, path: fs.create_directory(path),
+    "tree": lambda fs: fs.show_tree(),
+    "alloc": lambda fs: fs.show_allocation(),
+}
+
+
+def churn(rng, config):
+    capacity = config.total_blocks * config.block_size
+    mean_size = max(1, capacity // (4 * max(1, config.operations // 20)))
+    live = []
+    for i in range(config.operations):
+        if live and rng.random() < 0.5:
+            yield "delete", live.pop(rng.randrange(len(live)))
+        else:
+            live.append(f"/f{i}")
+            yield "create", live[-1], rng.randint(1, 2 * mean_size)
+    yield ("tree",)
+    yield ("alloc",)
+
+
+def deep_tree(rng, config):
+    depth = config.depth
+    path = ""
+    for level in range(depth):
+        path += f"/d{level}"
+        yield "mkdir", path
+    per_level = max(1, config.operations // depth)
+    path = ""
+    for level in range(depth):
+        path += f"/d{level}"
+        for i in range(per_level):
+            yield "create", f"{path}/f{i}", rng.randint(1, 4 * config.block_size)
+    yield ("tree",)
+
+
+def large_files(rng, config):
+    count = max(1, config.operations // 100)
+    size = config.total_blocks * config.block_size // (2 * count)
+    for i in range(count):
+        yield "create", f"/grande{i}", size
+    for i in range(0, count, 2):
+        yield "delete", f"/grande{i}"
+    for i in range(0, count, 2):
+        yield "create", f"/grande{i}", size
+    yield ("alloc",)
+
+
+def aging(rng, config):
+    capacity = config.total_blocks * config.block_size
+    small = max(1, capacity // (2 * config.operations))
+    live = []
+    for round_number in range(4):
+        for i in range(config.operations // 8):
+            live.append(f"/r{round_number}_{i}")
+            yield "create", live[-1], rng.randint(1, 2 * small)
+        rng.shuffle(live)
+        for _ in range(len(live) // 2):
+            yield "delete", live.pop()
+    for i in range(config.operations // 8):
+        yield "create", f"/novo{i}", rng.randint(small, 4 * small)
+    yield ("alloc",)
+
+
+WORKLOADS = {
+    "churn": churn,
+    "deep_tree": deep_tree,
+    "large_files": large_files,
+    "aging": aging,
+}
+
+
+def run(workload, config, trace_memory=False):
+    fs = FileSystem(
+        config.total_blocks, config.block_size, config.strategy, seed=config.seed
+    )
+    rng = random.Random(config.seed)
+    timings = {}
+    samples = []
+
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        operations = WORKLOADS[workload](rng, config)
+        for count, (op, *args) in enumerate(operations, 1):
+            before = time.perf_counter()
+            OPERATIONS[op](fs, *args)
+            timings.setdefault(op, []).append(time.perf_counter() - before)
+            if config.sample_every and count % config.sample_every == 0:
+                samples.append({"operation": count, **fs.allocation_stats()})
+    wall_time = time.perf_counter() - start
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return fs, timings, samples, wall_time, peak
+
+
+def summarize(samples):
+    samples.sort()
+    return {
+        "count": len(samples),
+        "total_s": sum(samples),
+        "mean_us": sum(samples) / len(samples) * 1e6,
+        "p50_us": samples[len(samples) // 2] * 1e6,
+        "p99_us": samples[min(len(samples) - 1, int(0.99 * len(samples)))] * 1e6,
+        "max_us": samples[-1] * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark de cargas sintéticas do sistema de arquivos."
+    )
+    parser.add_argument("--total-blocks", type=int, default=100_000)
+    parser.add_argument("--block-size", type=int, default=64)
+    parser.add_argument("--strategy", default="linked")
+    parser.add_argument("--operations", type=int, default=20_000)
+    parser.add_argument("--depth", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--sample-every",
+        type=int,
+        default=0,
+        help="coleta estatísticas de fragmentação a cada N operações",
+    )
+    parser.add_argument(
+        "--workloads", nargs="+", choices=list(WORKLOADS), default=list(WORKLOADS)
+    )
+    parser.add_argument(
+        "--no-memory", action="store_true", help="não mede o pico de memória"
+    )
+    parser.add_argument("--output", default="benchmark_results.json")
+    config = parser.parse_args()
+
+    results = {
+        "config": {
+            key: value
+            for key, value in vars(config).items()
+            if key not in ("workloads", "output", "no_memory")
+        },
+        "workloads": {},
+    }
+    for workload in config.workloads:
+        fs, timings, samples, wall_time, _ = run(workload, config)
+        peak = None if config.no_memory else run(workload, config, True)[-1]
+        results["workloads"][workload] = {
+            "wall_time_s": wall_time,
+            "peak_memory_bytes": peak,
+            "operations": {op: summarize(samples) for op, samples in timings.items()},
+            "fragmentation": fs.allocation_stats(),
+            "fragmentation_samples": samples,
+        }
+        print(f"{workload}: {wall_time:.3f}s")
+
+    with open(config.output, "w") as output:
+        json.dump(results, output, indent=2)
+    print(f"Resultados salvos em {config.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+from classes.free_space import block_ranges
+
+
+class AllocationStrategy:
+    name = None
+    extra_blocks = 0
+
+    def select(self, free_space, count, rng, after=None):
+        raise NotImplementedError
+
+    def allocate(self, free_space, file, count, rng):
+        after = file.blocks[-1] if file.blocks else None
+        blocks = self.select(free_space, count, rng, after)
+        if blocks is None:
+            return False
+        free_space.take(blocks)
+        file.blocks.extend(blocks)
+        return True
+
+    def read_seeks(self, file):
+        return sum(1 for _ in block_ranges(file.blocks))
+
+
+class LinkedAllocation(AllocationStrategy):
+    name = "linked"
+
+    def select(self, free_space, count, rng, after=None):
+        blocks = free_space.sample(count, rng)
+        blocks.sort()
+        return blocks
+
+
+class ContiguousAllocation(AllocationStrategy):
+    name = "contiguous"
+
+    def select(self, free_space, count, rng, after=None):
+        if count == 0:
+            return []
+        if after is not None and free_space.run_lengths.get(after + 1, 0) >= count:
+            return list(range(after + 1, after + 1 + count))
+        for start, length in free_space.runs():
+            if length >= count:
+                return list(range(start, start + count))
+        return None
+
+
+class ExtentAllocation(AllocationStrategy):
+    name = "extent"
+
+    def select(self, free_space, count, rng, after=None):
+        if count == 0:
+            return []
+        if after is not None and free_space.run_lengths.get(after + 1, 0) >= count:
+            return list(range(after + 1, after + 1 + count))
+
+        best = None
+        for start, length in free_space.runs():
+            if length >= count and (best is None or length < best[1]):
+                best = (start, length)
+                if length == count:
+                    break
+        if best is not None:
+            return list(range(best[0], best[0] + count))
+
+        # Nenhum trecho comporta o arquivo inteiro: usa os maiores trechos
+        # livres para minimizar o número de extents.
+        blocks = []
+        for start, length in sorted(free_space.runs(), key=lambda run: -run[1]):
+            take = min(length, count - len(blocks))
+            blocks.extend(range(start, start + take))
+            if len(blocks) == count:
+                return sorted(blocks)
+        return None
+
+
+class IndexedAllocation(ExtentAllocation):
+    name = "indexed"
+    extra_blocks = 1
+
+    def allocate(self, free_space, file, count, rng):
+        if file.index_block is not None:
+            return super().allocate(free_space, file, count, rng)
+
+        blocks = self.select(free_space, count + 1, rng)
+        if blocks is None:
+            return False
+        free_space.take(blocks)
+        file.index_block = blocks[0]
+        file.blocks.extend(blocks[1:])
+        return True
+
+    def read_seeks(self, file):
+        sequence = [file.index_block] + file.blocks
+        return sum(1 for _ in block_ranges(sequence))
+
+
+STRATEGIES = {
+    strategy.name: strategy
+    for strategy in (
+        LinkedAllocation,
+        ContiguousAllocation,
+        ExtentAllocation,
+        IndexedAllocation,
+    )
+}
@@ -0,0 +1,74 @@
+from collections import OrderedDict
+
+
+class BlockCache:
+    def __init__(self, store, capacity=64):
+        self.store = store
+        self.capacity = capacity
+        self.blocks = OrderedDict()
+        self.dirty = set()
+        self.hits = 0
+        self.misses = 0
+        self.writebacks = 0
+
+    def _lookup(self, block, load=True):
+        buffer = self.blocks.get(block)
+        if buffer is not None:
+            self.hits += 1
+            self.blocks.move_to_end(block)
+            return buffer
+
+        self.misses += 1
+        if load:
+            buffer = bytearray(self.store.read_block(block))
+        else:
+            buffer = bytearray(self.store.block_size)
+        self.blocks[block] = buffer
+        if len(self.blocks) > self.capacity:
+            self._evict()
+        return buffer
+
+    def _evict(self):
+        block, buffer = self.blocks.popitem(last=False)
+        if block in self.dirty:
+            self.dirty.discard(block)
+            self.store.write_block(block, buffer)
+            self.writebacks += 1
+
+    def read(self, block, offset=0, length=None):
+        buffer = self._lookup(block)
+        if length is None:
+            length = len(buffer) - offset
+        return bytes(buffer[offset : offset + length])
+
+    def write(self, block, data, offset=0):
+        whole_block = offset == 0 and len(data) == self.store.block_size
+        buffer = self._lookup(block, load=not whole_block)
+        buffer[offset : offset + len(data)] = data
+        self.dirty.add(block)
+
+    def discard(self, block):
+        self.blocks.pop(block, None)
+        self.dirty.discard(block)
+
+    def invalidate(self):
+        self.blocks.clear()
+        self.dirty.clear()
+
+    def sync(self):
+        for block in sorted(self.dirty):
+            self.store.write_block(block, self.blocks[block])
+            self.writebacks += 1
+        self.dirty.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "capacity": self.capacity,
+            "cached_blocks": len(self.blocks),
+            "dirty_blocks": len(self.dirty),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "writebacks": self.writebacks,
+        }
@@ -0,0 +1,100 @@
+from array import array
+
+FREE = -1
+
+
+class BlockStore:
+    def __init__(self, total_blocks, block_size, image=None):
+        self.total_blocks = total_blocks
+        self.block_size = block_size
+        self.on_write = None
+        self.image = image
+        if image is None:
+            self.owners = array("i", [FREE]) * total_blocks
+            self.used = array("i", [0]) * total_blocks
+            self.links = array("i", [-1]) * total_blocks
+            self.data = None
+            self.contents = {}
+        else:
+            self.owners = image.table("owners")
+            self.used = image.table("used")
+            self.links = image.table("links")
+            self.data = image.table("data")
+
+    # Com imagem, as tabelas são alteradas direto no mapeamento; antes da
+    # primeira alteração de cada página desde o último sync, a página
+    # original vai para o log de desfazer da imagem.
+    def _preserve(self, block, *tables):
+        if self.image is not None:
+            for name in tables:
+                self.image.preserve(name, block)
+
+    def read_block(self, block):
+        if self.data is None:
+            return self.contents.get(block) or bytes(self.block_size)
+        start = block * self.block_size
+        return bytes(self.data[start : start + self.block_size])
+
+    def write_block(self, block, data):
+        if self.on_write is not None:
+            self.on_write(block)
+        if self.data is None:
+            self.contents[block] = bytes(data)
+            return
+        self._preserve(block, "data")
+        start = block * self.block_size
+        self.data[start : start + self.block_size] = data
+
+    def assign(self, block, owner, used):
+        if self.on_write is not None:
+            self.on_write(block)
+        self._preserve(block, "owners", "used")
+        self.owners[block] = owner
+        self.used[block] = used
+
+    def set_link(self, block, next_block):
+        if self.on_write is not None:
+            self.on_write(block)
+        self._preserve(block, "links")
+        self.links[block] = next_block
+
+    def clear(self, block):
+        if self.on_write is not None:
+            self.on_write(block)
+        self._preserve(block, "owners", "used", "links", "data")
+        self.owners[block] = FREE
+        self.used[block] = 0
+        self.links[block] = -1
+        if self.data is None:
+            self.contents.pop(block, None)
+        else:
+            start = block * self.block_size
+            self.data[start : start + self.block_size] = bytes(self.block_size)
+
+    def capture(self, block):
+        data = None
+        if self.owners[block] != FREE:
+            if self.data is None:
+                data = self.contents.get(block)
+            else:
+                data = self.read_block(block)
+        return self.owners[block], self.used[block], self.links[block], data
+
+    def restore(self, block, state):
+        owner, used, link, data = state
+        self._preserve(block, "owners", "used", "links", "data")
+        self.owners[block] = owner
+        self.used[block] = used
+        self.links[block] = link
+        if self.data is None:
+            if data is None:
+                self.contents.pop(block, None)
+            else:
+                self.contents[block] = data
+        else:
+            start = block * self.block_size
+            self.data[start : start + self.block_size] = data or bytes(self.block_size)
+
+    def nbytes(self):
+        tables = (self.owners, self.used, self.links)
+        return sum(table.itemsize * len(table) for table in tables)
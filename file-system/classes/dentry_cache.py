@@ -0,0 +1,23 @@
+class DentryCache:
+    def __init__(self):
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, parent, name):
+        node = self.entries.get((parent, name))
+        if node is not None:
+            self.hits += 1
+            return node
+
+        self.misses += 1
+        node = parent.subdirectories.get(name) or parent.files.get(name)
+        if node is not None:
+            self.entries[(parent, name)] = node
+        return node
+
+    def invalidate(self, parent, name):
+        self.entries.pop((parent, name), None)
+
+    def clear(self):
+        self.entries.clear()
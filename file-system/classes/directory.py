@@ -1,11 +1,19 @@
+import threading
+
+
 class Directory:
     def __init__(self, name, parent=None):
         self.name = name
         self.parent = parent
         self.files = {}
         self.subdirectories = {}
+        self._path = None
+        self.lock = threading.Lock()
 
     def get_path(self):
-        if self.parent is None:
-            return "/"
-        return f"{self.parent.get_path()}/{self.name}".replace("//", "/")
+        if self._path is None:
+            if self.parent is None:
+                self._path = "/"
+            else:
+                self._path = f"{self.parent.get_path()}/{self.name}".replace("//", "/")
+        return self._path
@@ -0,0 +1,217 @@
+import json
+import mmap
+import os
+import struct
+
+MAGIC = b"SOFS"
+VERSION = 4
+PAGE_SIZE = mmap.ALLOCATIONGRANULARITY
+
+# magic, versão, total de blocos, tamanho do bloco, próximo id de arquivo,
+# estratégia, offset e tamanho do namespace, geração do checkpoint
+SUPERBLOCK = struct.Struct("<4sIQQQ16sQQQ")
+
+TABLES = ("owners", "used", "links", "bitmap", "data")
+
+# Log de desfazer: magic e geração do checkpoint protegido, seguidos de
+# registros (offset da página, conteúdo original da página).
+UNDO_MAGIC = b"SOUL"
+UNDO_HEADER = struct.Struct("<4sQ")
+UNDO_RECORD = struct.Struct("<Q")
+
+
+def _align(offset):
+    return -(-offset // PAGE_SIZE) * PAGE_SIZE
+
+
+def _item_size(name, block_size):
+    return {"bitmap": 1, "data": block_size}.get(name, 4)
+
+
+def image_layout(total_blocks, block_size):
+    layout = {}
+    offset = PAGE_SIZE
+    for name in TABLES:
+        item_size = _item_size(name, block_size)
+        layout[name] = (offset, total_blocks * item_size)
+        offset = _align(offset + total_blocks * item_size)
+    return layout, offset
+
+
+# Layout: superbloco | donos | bytes usados | links | bitmap | dados | namespace.
+# As tabelas por bloco são acessadas direto no mapeamento, então só as páginas
+# tocadas pelos comandos são lidas do disco. O namespace (diretórios e
+# registros de arquivos) fica no fim da imagem, em JSON.
+#
+# Consistência: as tabelas são alteradas no lugar, e a primeira alteração de
+# cada página desde o último checkpoint copia antes a página original para
+# um log de desfazer (<imagem>.undo). O save grava as tabelas, escreve o
+# namespace numa área que o superbloco atual não usa e só então troca o
+# superbloco, que é o ponto de commit. Ao abrir, um log da mesma geração do
+# superbloco indica uma queda antes do commit: as páginas originais voltam e
+# tabelas e namespace ficam de novo no último checkpoint. O log é escrito
+# sem buffer antes de cada página mudar, o que cobre a queda do processo; a
+# ordem em relação à escrita das páginas pelo kernel não é garantida numa
+# queda de energia.
+class DiskImage:
+    def __init__(self, path):
+        self.path = path
+        self.undo_path = path + ".undo"
+        self.fd = os.open(path, os.O_RDWR)
+        header = os.pread(self.fd, SUPERBLOCK.size, 0)
+        (
+            magic,
+            version,
+            self.total_blocks,
+            self.block_size,
+            self.next_file_id,
+            strategy,
+            self.namespace_offset,
+            self.namespace_length,
+            self.generation,
+        ) = SUPERBLOCK.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            os.close(self.fd)
+            raise ValueError(f"'{path}' não é uma imagem de disco válida")
+        self.strategy = strategy.rstrip(b"\0").decode()
+
+        self.layout, self.tables_end = image_layout(self.total_blocks, self.block_size)
+        self.mm = mmap.mmap(self.fd, self.tables_end)
+        self.view = memoryview(self.mm)
+        self.exported = []
+        self.undo = None
+        self.preserved = set()
+        self._recover()
+
+    @classmethod
+    def create(cls, path, total_blocks, block_size, strategy="linked"):
+        layout, tables_end = image_layout(total_blocks, block_size)
+        with open(path, "wb") as image:
+            image.truncate(tables_end)
+            for name in ("owners", "links"):
+                offset, length = layout[name]
+                image.seek(offset)
+                chunk = b"\xff" * min(length, 1 << 20)
+                for start in range(0, length, len(chunk)):
+                    image.write(chunk[: length - start])
+            image.seek(0)
+            image.write(
+                SUPERBLOCK.pack(
+                    MAGIC,
+                    VERSION,
+                    total_blocks,
+                    block_size,
+                    0,
+                    strategy.encode(),
+                    tables_end,
+                    0,
+                    0,
+                )
+            )
+        return cls(path)
+
+    def table(self, name):
+        offset, length = self.layout[name]
+        region = self.view[offset : offset + length]
+        if name not in ("bitmap", "data"):
+            region = region.cast("i")
+        self.exported.append(region)
+        return region
+
+    def read_namespace(self):
+        if not self.namespace_length:
+            return {"directories": [], "files": []}
+        data = os.pread(self.fd, self.namespace_length, self.namespace_offset)
+        return json.loads(data)
+
+    def preserve(self, name, index, count=1):
+        offset, _ = self.layout[name]
+        item_size = _item_size(name, self.block_size)
+        start = offset + index * item_size
+        end = start + count * item_size
+        page = start - start % PAGE_SIZE
+        while page < end:
+            if page not in self.preserved:
+                self._save_page(page)
+            page += PAGE_SIZE
+
+    def _save_page(self, page):
+        if self.undo is None:
+            self.undo = open(self.undo_path, "wb", buffering=0)
+            self.undo.write(UNDO_HEADER.pack(UNDO_MAGIC, self.generation))
+        self.undo.write(UNDO_RECORD.pack(page) + self.mm[page : page + PAGE_SIZE])
+        self.preserved.add(page)
+
+    def _recover(self):
+        if not os.path.exists(self.undo_path):
+            return
+        with open(self.undo_path, "rb") as undo:
+            header = undo.read(UNDO_HEADER.size)
+            current = header == UNDO_HEADER.pack(UNDO_MAGIC, self.generation)
+            record_size = UNDO_RECORD.size + PAGE_SIZE
+            while current:
+                record = undo.read(record_size)
+                # Um registro incompleto é de uma página que não chegou a
+                # ser alterada.
+                if len(record) < record_size:
+                    break
+                (page,) = UNDO_RECORD.unpack_from(record)
+                self.mm[page : page + PAGE_SIZE] = record[UNDO_RECORD.size :]
+        if current:
+            self.mm.flush()
+            os.fsync(self.fd)
+        os.remove(self.undo_path)
+
+    def _discard_undo(self):
+        if self.undo is not None:
+            self.undo.close()
+            self.undo = None
+        if os.path.exists(self.undo_path):
+            os.remove(self.undo_path)
+        self.preserved.clear()
+
+    def save(self, namespace, next_file_id, strategy, generation):
+        data = json.dumps(namespace, separators=(",", ":")).encode()
+        self.mm.flush()
+
+        # O namespace novo vai logo depois das tabelas ou logo depois do
+        # atual, sem nunca sobrescrever o que o superbloco ainda aponta.
+        offset = self.tables_end
+        if self.namespace_length and len(data) > self.namespace_offset - offset:
+            offset = self.namespace_offset + self.namespace_length
+        os.pwrite(self.fd, data, offset)
+        os.fsync(self.fd)
+
+        self._switch(offset, len(data), next_file_id, strategy, generation)
+        self._discard_undo()
+        os.ftruncate(self.fd, offset + len(data))
+
+    def _switch(self, offset, length, next_file_id, strategy, generation):
+        self.mm[: SUPERBLOCK.size] = SUPERBLOCK.pack(
+            MAGIC,
+            VERSION,
+            self.total_blocks,
+            self.block_size,
+            next_file_id,
+            strategy.encode(),
+            offset,
+            length,
+            generation,
+        )
+        self.mm.flush(0, PAGE_SIZE)
+        os.fsync(self.fd)
+        self.next_file_id = next_file_id
+        self.strategy = strategy
+        self.namespace_offset = offset
+        self.namespace_length = length
+        self.generation = generation
+
+    def close(self):
+        if self.undo is not None:
+            self.undo.close()
+            self.undo = None
+        for region in self.exported:
+            region.release()
+        self.view.release()
+        self.mm.close()
+        os.close(self.fd)
@@ -1,5 +1,28 @@
 class File:
-    def __init__(self, name, size):
+    def __init__(self, name, size, file_id=None):
+        self.id = file_id
         self.name = name
         self.size = size
-        self.blocks = []
+        self._blocks = []
+        self.block_loader = None
+        self.index_block = None
+        self.allocation = None
+        self.extents = 0
+        self.link_distance = 0
+
+    @property
+    def blocks(self):
+        if self.block_loader is not None:
+            self._blocks = self.block_loader()
+            self.block_loader = None
+        return self._blocks
+
+    @blocks.setter
+    def blocks(self, blocks):
+        self._blocks = blocks
+        self.block_loader = None
+
+    def block_count(self):
+        if self.block_loader is not None:
+            return self.block_loader.args[1]
+        return len(self._blocks)
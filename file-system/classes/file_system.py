@@ -1,125 +1,1035 @@
+import fnmatch
+import heapq
+import itertools
 import math
 import os
 import random
+import threading
+from functools import partial
 
+from classes.allocation import STRATEGIES
+from classes.block_cache import BlockCache
+from classes.block_store import FREE, BlockStore
+from classes.dentry_cache import DentryCache
 from classes.directory import Directory
+from classes.disk_image import DiskImage
 from classes.file import File
+from classes.free_space import FreeSpaceMap
+from classes.journal import encode_data
+from classes.locks import SharedLock
+from classes.snapshot import Snapshot
 
 
 class FileSystem:
-    def __init__(self, total_blocks, block_size):
+    def __init__(
+        self,
+        total_blocks,
+        block_size,
+        strategy="linked",
+        image=None,
+        cache_blocks=64,
+        seed=None,
+    ):
         self.total_blocks = total_blocks
         self.block_size = block_size
-        self.memory = [{} for _ in range(total_blocks)]
-        self.block_links = [-1] * total_blocks
+        self.strategy = STRATEGIES[strategy]()
+        self.image = image
+        self.store = BlockStore(total_blocks, block_size, image)
+        self.cache = BlockCache(self.store, cache_blocks)
+        self.files_by_id = {}
+        self.next_file_id = 0
+        self.free_space = FreeSpaceMap(
+            total_blocks,
+            image.table("bitmap") if image else None,
+            partial(image.preserve, "bitmap") if image else None,
+        )
         self.root = Directory("/")
         self.current_directory = self.root
+        self.dentries = DentryCache()
+        self.defrag_pending = None
+        self.snapshots = []
+        self.next_snapshot_id = 1
+        self.rng = random.Random(seed)
+        self.journal = None
+        self.generation = 0
+        # Sessões concorrentes compartilham namespace_lock e travam os
+        # diretórios que alteram; allocator_lock protege o mapa de espaço
+        # livre, as tabelas de blocos e o cache.
+        self.namespace_lock = SharedLock()
+        self.allocator_lock = threading.RLock()
+
+    @classmethod
+    def format(cls, path, total_blocks, block_size, strategy="linked"):
+        DiskImage.create(path, total_blocks, block_size, strategy).close()
+        return cls.mount(path)
+
+    @classmethod
+    def mount(cls, path):
+        image = DiskImage(path)
+        fs = cls(image.total_blocks, image.block_size, image.strategy, image)
+        fs.next_file_id = image.next_file_id
+        fs.generation = image.generation
+        fs._load_namespace(image.read_namespace())
+        return fs
+
+    def _load_namespace(self, namespace):
+        directories = {0: self.root}
+        for directory_id, parent_id, name in namespace["directories"]:
+            parent = directories[parent_id]
+            directory = Directory(name, parent)
+            parent.subdirectories[name] = directory
+            directories[directory_id] = directory
+
+        for record in namespace["files"]:
+            file_id, directory_id, name, size, allocation, index_block = record[:6]
+            first_block, block_count, extents, link_distance = record[6:]
+            file = File(name, size, file_id)
+            file.allocation = STRATEGIES[allocation]()
+            file.index_block = index_block
+            file.extents = extents
+            file.link_distance = link_distance
+            file.block_loader = partial(self._load_chain, first_block, block_count)
+            directories[directory_id].files[name] = file
+            self.files_by_id[file_id] = file
+
+    def _load_chain(self, first_block, block_count):
+        blocks = []
+        block = first_block
+        while len(blocks) < block_count:
+            blocks.append(block)
+            block = self.store.links[block]
+        return blocks
+
+    def _dump_namespace(self):
+        namespace = {"directories": [], "files": []}
+        directory_ids = {self.root: 0}
+        pending = [self.root]
+        while pending:
+            directory = pending.pop()
+            directory_id = directory_ids[directory]
+            for subdirectory in directory.subdirectories.values():
+                directory_ids[subdirectory] = len(directory_ids)
+                namespace["directories"].append(
+                    [directory_ids[subdirectory], directory_id, subdirectory.name]
+                )
+                pending.append(subdirectory)
+            for file in directory.files.values():
+                if file.block_loader is not None:
+                    first_block, block_count = file.block_loader.args
+                else:
+                    first_block = file.blocks[0] if file.blocks else -1
+                    block_count = len(file.blocks)
+                namespace["files"].append(
+                    [
+                        file.id,
+                        directory_id,
+                        file.name,
+                        file.size,
+                        file.allocation.name,
+                        file.index_block,
+                        first_block,
+                        block_count,
+                        file.extents,
+                        file.link_distance,
+                    ]
+                )
+        return namespace
+
+    def journal_header(self):
+        version, state, gauss = self.rng.getstate()
+        return {
+            "total_blocks": self.total_blocks,
+            "block_size": self.block_size,
+            "strategy": self.strategy.name,
+            "generation": self.generation,
+            "rng_state": [version, list(state), gauss],
+        }
+
+    def restore_rng(self, header):
+        version, state, gauss = header["rng_state"]
+        self.rng.setstate((version, tuple(state), gauss))
+
+    def attach_journal(self, journal):
+        self.journal = journal
+
+    def _log(self, op, *args):
+        if self.journal is not None:
+            self.journal.log(op, self.current_directory.get_path(), *args)
+
+    def sync(self):
+        self.cache.sync()
+        if self.image is not None:
+            # A geração liga o journal à imagem: se a queda vier depois de
+            # gravar a imagem e antes do checkpoint do journal, os registros
+            # antigos já estão na imagem e não devem ser repetidos.
+            self.generation += 1
+            self.image.save(
+                self._dump_namespace(),
+                self.next_file_id,
+                self.strategy.name,
+                self.generation,
+            )
+            # Com a imagem gravada, os registros anteriores não são mais
+            # necessários para recuperar o estado.
+            if self.journal is not None:
+                self.journal.checkpoint(self.journal_header())
+        elif self.journal is not None:
+            self.journal.commit()
+
+    def unmount(self):
+        if self.image is None:
+            if self.journal is not None:
+                self.journal.close()
+                self.journal = None
+            return
+        self.sync()
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+        self.cache = None
+        self.store = None
+        self.free_space = None
+        self.image.close()
+        self.image = None
+
+    def set_strategy(self, name):
+        self._log("strategy", name)
+        if name not in STRATEGIES:
+            print(f"Erro: Estratégia inválida! Opções: {', '.join(STRATEGIES)}")
+            return
+        self.strategy = STRATEGIES[name]()
+        print(f"Estratégia de alocação: {name}")
 
     def allocate_blocks(self, file):
-        required_blocks = math.ceil(file.size / self.block_size)
-        free_blocks = [i for i, block in enumerate(self.memory) if not block]
+        with self.allocator_lock:
+            if file.id in self.files_by_id:
+                self._touch(file)
+            strategy = file.allocation or self.strategy
+            first_new = len(file.blocks)
+            required_blocks = math.ceil(file.size / self.block_size) - first_new
+            extra_blocks = strategy.extra_blocks if file.index_block is None else 0
 
-        if len(free_blocks) < required_blocks:
-            print("Erro: Espaço insuficiente!")
-            return False
+            if self.free_space.free_count < required_blocks + extra_blocks:
+                print("Erro: Espaço insuficiente!")
+                return False
 
-        allocated = random.sample(free_blocks, required_blocks)
-        allocated.sort()
+            if not strategy.allocate(self.free_space, file, required_blocks, self.rng):
+                print("Erro: Espaço contíguo insuficiente!")
+                return False
+            file.allocation = strategy
 
-        for i in range(len(allocated) - 1):
-            self.block_links[allocated[i]] = allocated[i + 1]
+            if file.index_block is not None:
+                self.store.assign(file.index_block, file.id, 0)
+            if first_new == 0 and file.blocks:
+                file.extents += 1
+            for i in range(max(first_new, 1), len(file.blocks)):
+                previous, block = file.blocks[i - 1], file.blocks[i]
+                self.store.set_link(previous, block)
+                file.link_distance += abs(block - previous)
+                if block != previous + 1:
+                    file.extents += 1
 
-        for block in allocated:
-            self.memory[block][file.name] = min(self.block_size, file.size)
-            file.size -= self.block_size
-            file.blocks.append(block)
+            for i in range(max(first_new - 1, 0), len(file.blocks)):
+                used = min(self.block_size, file.size - i * self.block_size)
+                self.store.assign(file.blocks[i], file.id, used)
 
-        return True
+            return True
 
-    def create_file(self, name, size):
-        if (
-            name in self.current_directory.files
-            or name in self.current_directory.subdirectories
-        ):
+    def resolve(self, path):
+        node = self.root if path.startswith("/") else self.current_directory
+        for name in path.split("/"):
+            if not name or name == ".":
+                continue
+            if not isinstance(node, Directory):
+                return None
+            if name == "..":
+                node = node.parent or node
+                continue
+            node = self.dentries.lookup(node, name)
+            if node is None:
+                return None
+        return node
+
+    def _resolve_parent(self, path):
+        stripped = path.rstrip("/")
+        if "/" in stripped:
+            parent_path, name = stripped.rsplit("/", 1)
+            parent = self.resolve(parent_path or "/")
+        else:
+            parent, name = self.current_directory, stripped
+        if not isinstance(parent, Directory) or name in ("", ".", ".."):
+            return None, None
+        return parent, name
+
+    def _find_file(self, path):
+        file = self.resolve(path)
+        if not isinstance(file, File):
+            print("Erro: Arquivo não encontrado!")
+            return None
+        return file
+
+    def create_file(self, path, size):
+        self._log("touch", path, size)
+        parent, name = self._resolve_parent(path)
+        if parent is None:
+            print("Erro: Diretório não encontrado!")
+            return
+        if name in parent.files or name in parent.subdirectories:
             print("Erro: Nome já existe!")
             return
 
-        new_file = File(name, size)
-        if self.allocate_blocks(new_file):
-            self.current_directory.files[name] = new_file
-            print(f"Arquivo '{name}' criado.")
+        with self.allocator_lock:
+            new_file = File(name, size, self.next_file_id)
+            if not self.allocate_blocks(new_file):
+                return
+            self._track_file_id(new_file.id)
+            self.next_file_id += 1
+            self.files_by_id[new_file.id] = new_file
+        self._touch(parent)
+        parent.files[name] = new_file
+        print(f"Arquivo '{name}' criado.")
 
-    def delete_file(self, name):
-        if name not in self.current_directory.files:
+    def delete_file(self, path):
+        self._log("rm", path)
+        parent, name = self._resolve_parent(path)
+        if parent is None or name not in parent.files:
             print("Erro: Arquivo não encontrado!")
             return
 
-        file = self.current_directory.files[name]
-        for block in file.blocks:
-            del self.memory[block][name]
-            self.block_links[block] = -1
-
-        del self.current_directory.files[name]
+        self._touch(parent)
+        self._release_files([parent.files[name]])
+        del parent.files[name]
+        self.dentries.invalidate(parent, name)
         print(f"Arquivo '{name}' removido.")
 
-    def create_directory(self, name):
-        if (
-            name in self.current_directory.files
-            or name in self.current_directory.subdirectories
-        ):
+    def _release_files(self, files):
+        with self.allocator_lock:
+            blocks = []
+            for file in files:
+                blocks.extend(self._layout(file))
+                self._track_file_id(file.id)
+                del self.files_by_id[file.id]
+            for block in blocks:
+                self.cache.discard(block)
+                self.store.clear(block)
+            self.free_space.release(blocks)
+
+    def write_file(self, path, offset, data):
+        self._log("write", path, offset, encode_data(data))
+        file = self._find_file(path)
+        if file is None:
+            return False
+        return self._write(file, offset, data)
+
+    def _write(self, file, offset, data):
+        with self.allocator_lock:
+            end = offset + len(data)
+            if end > file.size:
+                self._touch(file)
+                old_size = file.size
+                file.size = end
+                if not self.allocate_blocks(file):
+                    file.size = old_size
+                    return False
+
+            position = offset
+            while position < end:
+                index, block_offset = divmod(position, self.block_size)
+                length = min(self.block_size - block_offset, end - position)
+                chunk = data[position - offset : position - offset + length]
+                self.cache.write(file.blocks[index], chunk, block_offset)
+                position += length
+            return True
+
+    def append_file(self, path, data):
+        self._log("append", path, encode_data(data))
+        file = self._find_file(path)
+        if file is None:
+            return False
+        return self._write(file, file.size, data)
+
+    def read_file(self, path, offset=0, length=None):
+        file = self._find_file(path)
+        if file is None:
+            return None
+
+        end = file.size if length is None else min(file.size, offset + length)
+        chunks = []
+        position = offset
+        with self.allocator_lock:
+            while position < end:
+                index, block_offset = divmod(position, self.block_size)
+                chunk_length = min(self.block_size - block_offset, end - position)
+                chunks.append(
+                    self.cache.read(file.blocks[index], block_offset, chunk_length)
+                )
+                position += chunk_length
+        return b"".join(chunks)
+
+    def show_file(self, path, offset=0, length=None):
+        data = self.read_file(path, offset, length)
+        if data is not None:
+            print(data.decode(errors="replace"))
+
+    def show_cache_stats(self):
+        stats = self.cache.stats()
+        print(
+            f"Cache: {stats['cached_blocks']}/{stats['capacity']} blocos, "
+            f"{stats['dirty_blocks']} sujos, {stats['hits']} acertos, "
+            f"{stats['misses']} faltas ({stats['hit_rate']:.1%}), "
+            f"{stats['writebacks']} escritas no disco"
+        )
+
+    def create_directory(self, path):
+        self._log("mkdir", path)
+        parent, name = self._resolve_parent(path)
+        if parent is None:
+            print("Erro: Diretório não encontrado!")
+            return
+        if name in parent.files or name in parent.subdirectories:
             print("Erro: Nome já existe!")
             return
 
-        new_directory = Directory(name, self.current_directory)
-        self.current_directory.subdirectories[name] = new_directory
+        self._touch(parent)
+        new_directory = Directory(name, parent)
+        parent.subdirectories[name] = new_directory
         print(f"Diretório '{name}' criado.")
 
-    def delete_directory(self, name):
-        if name not in self.current_directory.subdirectories:
+    def delete_directory(self, path, recursive=False):
+        self._log("rmdir", path, recursive)
+        parent, name = self._resolve_parent(path)
+        if parent is None or name not in parent.subdirectories:
             print("Erro: Diretório não encontrado!")
             return
 
-        directory = self.current_directory.subdirectories[name]
-        if directory.files or directory.subdirectories:
+        directory = parent.subdirectories[name]
+        if not recursive and (directory.files or directory.subdirectories):
             print("Erro: Diretório não está vazio!")
             return
+        if self._is_within(self.current_directory, directory):
+            print("Erro: Diretório em uso!")
+            return
 
-        del self.current_directory.subdirectories[name]
+        # Todos os blocos da subárvore são liberados de uma vez, em uma única
+        # passada ordenada sobre o mapa de espaço livre.
+        files = []
+        for _, node in self._walk(directory):
+            if isinstance(node, File):
+                files.append(node)
+            else:
+                for child in itertools.chain(node.subdirectories, node.files):
+                    self.dentries.invalidate(node, child)
+        self._touch(parent)
+        self._release_files(files)
+
+        del parent.subdirectories[name]
+        self.dentries.invalidate(parent, name)
         print(f"Diretório '{name}' removido.")
 
-    def list_directory(self):
-        print("Arquivos:", list(self.current_directory.files.keys()))
-        print("Diretórios:", list(self.current_directory.subdirectories.keys()))
+    def _is_within(self, directory, ancestor):
+        while directory is not None:
+            if directory is ancestor:
+                return True
+            directory = directory.parent
+        return False
+
+    def _destination(self, source, destination):
+        target = self.resolve(destination)
+        if isinstance(target, Directory):
+            return target, source.name
+        return self._resolve_parent(destination)
+
+    def _copy_file(self, source, parent, name):
+        with self.allocator_lock:
+            copy = File(name, source.size, self.next_file_id)
+            copy.allocation = source.allocation
+            if not self.allocate_blocks(copy):
+                return None
+            self._touch(parent)
+            self._track_file_id(copy.id)
+            self.next_file_id += 1
+            self.files_by_id[copy.id] = copy
+            parent.files[name] = copy
+            for source_block, block in zip(source.blocks, copy.blocks):
+                self.cache.write(block, self.cache.read(source_block))
+            return copy
+
+    def _source(self, path):
+        parent, name = self._resolve_parent(path)
+        if parent is None:
+            return None, None
+        return parent, parent.subdirectories.get(name) or parent.files.get(name)
+
+    def copy(self, source_path, destination, recursive=False):
+        self._log("cp", source_path, destination, recursive)
+        _, source = self._source(source_path)
+        if source is None:
+            print("Erro: Origem não encontrada!")
+            return
+        if isinstance(source, Directory) and not recursive:
+            print("Erro: Use cp -r para copiar diretórios!")
+            return
+        parent, name = self._destination(source, destination)
+        if parent is None:
+            print("Erro: Diretório não encontrado!")
+            return
+        if name in parent.files or name in parent.subdirectories:
+            print("Erro: Nome já existe!")
+            return
+
+        if isinstance(source, File):
+            if self._copy_file(source, parent, name) is not None:
+                print(f"'{source.name}' copiado para '{name}'.")
+            return
+
+        if self._is_within(parent, source):
+            print("Erro: Não é possível copiar um diretório para dentro de si!")
+            return
+        directories = [
+            node for _, node in self._walk(source) if isinstance(node, Directory)
+        ]
+        required = sum(
+            file.block_count() + (file.index_block is not None)
+            for directory in directories
+            for file in directory.files.values()
+        )
+        if required > self.free_space.free_count:
+            print("Erro: Espaço insuficiente!")
+            return
+
+        self._touch(parent)
+        copies = {}
+        for directory in directories:
+            if directory is source:
+                target = Directory(name, parent)
+                parent.subdirectories[name] = target
+            else:
+                target = Directory(directory.name, copies[directory.parent])
+                copies[directory.parent].subdirectories[directory.name] = target
+            copies[directory] = target
+            for file in directory.files.values():
+                if self._copy_file(file, target, file.name) is None:
+                    self._release_tree(parent.subdirectories.pop(name))
+                    return
+        print(f"'{source.name}' copiado para '{name}'.")
+
+    def _release_tree(self, directory):
+        files = [node for _, node in self._walk(directory) if isinstance(node, File)]
+        self._release_files(files)
+
+    def move(self, source_path, destination):
+        self._log("mv", source_path, destination)
+        old_parent, source = self._source(source_path)
+        if source is None:
+            print("Erro: Origem não encontrada!")
+            return
+        parent, name = self._destination(source, destination)
+        if parent is None:
+            print("Erro: Diretório não encontrado!")
+            return
+        if name in parent.files or name in parent.subdirectories:
+            print("Erro: Nome já existe!")
+            return
+        if isinstance(source, Directory) and self._is_within(parent, source):
+            print("Erro: Não é possível mover um diretório para dentro de si!")
+            return
+
+        self._touch(old_parent, parent, source)
+        is_file = isinstance(source, File)
+        del (old_parent.files if is_file else old_parent.subdirectories)[source.name]
+        self.dentries.invalidate(old_parent, source.name)
+        print(f"'{source.name}' movido para '{name}'.")
+        source.name = name
+        if is_file:
+            parent.files[name] = source
+            return
+
+        source.parent = parent
+        parent.subdirectories[name] = source
+        for _, node in self._walk(source):
+            if isinstance(node, Directory):
+                node._path = None
+
+    def walk(self, path="/"):
+        top = self.resolve(path)
+        if not isinstance(top, Directory):
+            return iter(())
+        return self._walk(top)
+
+    def _walk(self, top):
+        yield 0, top
+        stack = [(top, iter(top.subdirectories.values()), 1)]
+        while stack:
+            directory, subdirectories, depth = stack[-1]
+            subdirectory = next(subdirectories, None)
+            if subdirectory is not None:
+                yield depth, subdirectory
+                children = iter(subdirectory.subdirectories.values())
+                stack.append((subdirectory, children, depth + 1))
+                continue
+            stack.pop()
+            for file in directory.files.values():
+                yield depth, file
+
+    def list_entries(self, path=".", pattern=None, sort=False, offset=0, limit=None):
+        directory = self.resolve(path)
+        if not isinstance(directory, Directory):
+            return None
+
+        entries = itertools.chain(
+            ((name + "/") for name in directory.subdirectories), directory.files
+        )
+        if pattern is not None:
+            entries = (
+                entry
+                for entry in entries
+                if fnmatch.fnmatchcase(entry.rstrip("/"), pattern)
+            )
+        if sort:
+            if limit is None:
+                entries = iter(sorted(entries))
+            else:
+                entries = iter(heapq.nsmallest(offset + limit, entries))
+        stop = None if limit is None else offset + limit
+        return itertools.islice(entries, offset, stop)
+
+    def list_directory(
+        self, path=".", pattern=None, sort=False, page=1, page_size=100
+    ):
+        entries = self.list_entries(
+            path, pattern, sort, (page - 1) * page_size, page_size
+        )
+        if entries is None:
+            print("Erro: Diretório não encontrado!")
+            return
+
+        shown = 0
+        for chunk in iter(lambda: list(itertools.islice(entries, 1024)), []):
+            print("\n".join(chunk))
+            shown += len(chunk)
+        print(f"-- página {page}: {shown} entrada(s) --")
+
+    def read_seeks(self, path):
+        file = self._find_file(path)
+        if file is None:
+            return None
+        return file.allocation.read_seeks(file)
+
+    def show_read_seeks(self, path):
+        seeks = self.read_seeks(path)
+        if seeks is not None:
+            file = self.resolve(path)
+            print(
+                f"Arquivo '{file.name}' ({file.allocation.name}): "
+                f"{seeks} seek(s) para leitura sequencial"
+            )
+
+    def disk_usage(self):
+        used = self.free_space.used_count
+        return {
+            "total_blocks": self.total_blocks,
+            "used_blocks": used,
+            "free_blocks": self.free_space.free_count,
+            "free_bytes": self.free_space.free_count * self.block_size,
+        }
+
+    def show_disk_usage(self):
+        usage = self.disk_usage()
+        print(
+            f"Blocos: {usage['total_blocks']} total, {usage['used_blocks']} usados, "
+            f"{usage['free_blocks']} livres ({usage['free_bytes']} bytes livres)"
+        )
+
+    def allocation_stats(self, percentiles=(50, 90, 99)):
+        free = self.free_space.free_count
+        largest = self.free_space.largest_run()
+        files = self.files_by_id.values()
+        extents = sorted(file.extents for file in files)
+        links = sum(max(file.block_count() - 1, 0) for file in files)
+        distance = sum(file.link_distance for file in files)
+
+        extents_per_file = {
+            "mean": sum(extents) / len(extents) if extents else 0.0,
+            "max": extents[-1] if extents else 0,
+        }
+        for percentile in percentiles:
+            index = min(len(extents) - 1, len(extents) * percentile // 100)
+            extents_per_file[f"p{percentile}"] = extents[index] if extents else 0
+
+        return {
+            "free_blocks": free,
+            "used_blocks": self.free_space.used_count,
+            "free_runs": len(self.free_space.run_starts),
+            "free_extent_histogram": self.free_space.histogram(),
+            "largest_free_run": largest,
+            "external_fragmentation": 1 - largest / free if free else 0.0,
+            "files": len(extents),
+            "extents_per_file": extents_per_file,
+            "mean_link_distance": distance / links if links else 0.0,
+        }
+
+    def show_allocation_stats(self):
+        stats = self.allocation_stats()
+        extents = stats["extents_per_file"]
+        print(
+            f"Livres: {stats['free_blocks']} blocos em {stats['free_runs']} trechos "
+            f"(maior: {stats['largest_free_run']}, "
+            f"fragmentação externa: {stats['external_fragmentation']:.1%})"
+        )
+        print(
+            "Histograma de trechos livres:",
+            ", ".join(
+                f"{size}+: {count}"
+                for size, count in stats["free_extent_histogram"].items()
+            ),
+        )
+        print(
+            f"Extents por arquivo ({stats['files']} arquivos): média "
+            f"{extents['mean']:.2f}, p50 {extents['p50']}, p90 {extents['p90']}, "
+            f"p99 {extents['p99']}, máx {extents['max']}"
+        )
+        print(
+            "Distância média entre blocos encadeados: "
+            f"{stats['mean_link_distance']:.1f}"
+        )
+
+    def _move_block(self, source, target):
+        if source in self.cache.blocks:
+            data = self.cache.blocks[source]
+            self.cache.discard(source)
+        else:
+            data = self.store.read_block(source)
+        self.store.write_block(target, data)
+        self.store.assign(target, self.store.owners[source], self.store.used[source])
+        self.store.clear(source)
+
+    def _recount_layout(self, file):
+        blocks = file.blocks
+        file.extents = 1 if blocks else 0
+        file.link_distance = 0
+        for previous, block in zip(blocks, blocks[1:]):
+            self.store.set_link(previous, block)
+            file.link_distance += abs(block - previous)
+            if block != previous + 1:
+                file.extents += 1
+        if blocks:
+            self.store.set_link(blocks[-1], -1)
+
+    def _layout(self, file):
+        if file.index_block is None:
+            return list(file.blocks)
+        return [file.index_block] + file.blocks
+
+    def _spare_block(self, window, length):
+        for start, run_length in self.free_space.runs():
+            if start < window:
+                return start
+            if start + run_length > window + length:
+                return max(start, window + length)
+        return None
+
+    def _compact_file(self, file, window, positions, touched):
+        self._touch(file)
+        layout = self._layout(file)
+        offset = 0 if file.index_block is None else 1
+        positions[file.id] = {block: i - offset for i, block in enumerate(layout)}
+        moves = 0
+        for i in range(len(layout)):
+            target = window + i
+            if layout[i] == target:
+                continue
+
+            owner = self.store.owners[target]
+            if owner != FREE:
+                spare = self._spare_block(window, len(layout))
+                if spare is None:
+                    return moves, False
+                self._displace(target, spare, positions, touched)
+                moves += 1
+                if owner == file.id:
+                    layout[positions[file.id][spare] + offset] = spare
+
+            source = layout[i]
+
+            self.free_space.take_range(target, 1)
+            self._move_block(source, target)
+            self.free_space.release_range(source, 1)
+            index = positions[file.id].pop(source)
+            positions[file.id][target] = index
+            if index < 0:
+                file.index_block = target
+            else:
+                file.blocks[index] = target
+            layout[i] = target
+            moves += 1
+
+        self._recount_layout(file)
+        return moves, True
+
+    def _displace(self, block, spare, positions, touched):
+        owner = self.files_by_id[self.store.owners[block]]
+        self._touch(owner)
+        if owner.id not in positions:
+            positions[owner.id] = {b: i for i, b in enumerate(owner.blocks)}
+            if owner.index_block is not None:
+                positions[owner.id][owner.index_block] = -1
+
+        self.free_space.take_range(spare, 1)
+        self._move_block(block, spare)
+        self.free_space.release_range(block, 1)
+        index = positions[owner.id].pop(block)
+        positions[owner.id][spare] = index
+        if index < 0:
+            owner.index_block = spare
+        else:
+            owner.blocks[index] = spare
+            if index > 0:
+                self.store.set_link(owner.blocks[index - 1], spare)
+            if index + 1 < len(owner.blocks):
+                self.store.set_link(spare, owner.blocks[index + 1])
+        touched.add(owner.id)
+
+    def defragment(self, budget=None):
+        # Compactação deslizante: os arquivos são visitados na ordem do
+        # primeiro bloco e cada um é reescrito contíguo a partir do cursor,
+        # empurrando para fora da janela os blocos de arquivos ainda não
+        # visitados. O estado (fila e cursor) persiste entre chamadas.
+        self._log("defrag", budget)
+        before = self.allocation_stats()
+        if self.defrag_pending is None:
+            order = sorted(
+                self.files_by_id.values(),
+                key=lambda file: min(self._layout(file), default=-1),
+                reverse=True,
+            )
+            self.defrag_pending = ([file.id for file in order], 0)
+        pending, window = self.defrag_pending
+
+        moves = relocated = 0
+        positions = {}
+        touched = set()
+        complete = True
+        while pending:
+            file = self.files_by_id.get(pending[-1])
+            if file is None:
+                pending.pop()
+                continue
+
+            layout = self._layout(file)
+            cost = sum(1 for i, block in enumerate(layout) if block != window + i)
+            cost += sum(
+                1
+                for block in range(window, window + len(layout))
+                if self.store.owners[block] not in (FREE, file.id)
+            )
+            if budget is not None and moves and moves + cost > budget:
+                complete = False
+                break
+
+            file_moves, done = self._compact_file(file, window, positions, touched)
+            moves += file_moves
+            if not done:
+                complete = False
+                break
+            pending.pop()
+            window += len(layout)
+            if file_moves:
+                relocated += 1
+
+        for file_id in touched:
+            if file_id in self.files_by_id:
+                self._recount_layout(self.files_by_id[file_id])
+        self.defrag_pending = None if complete else (pending, window)
+        return {
+            "moves": moves,
+            "files_relocated": relocated,
+            "complete": complete,
+            "before": before,
+            "after": self.allocation_stats(),
+        }
+
+    def show_defragment(self, budget=None):
+        report = self.defragment(budget)
+        before, after = report["before"], report["after"]
+        print(
+            f"Desfragmentação: {report['moves']} blocos movidos, "
+            f"{report['files_relocated']} arquivos realocados"
+            + ("" if report["complete"] else " (passada incompleta)")
+        )
+        print(
+            "Extents por arquivo: "
+            f"{before['extents_per_file']['mean']:.2f} -> "
+            f"{after['extents_per_file']['mean']:.2f}, "
+            "fragmentação externa: "
+            f"{before['external_fragmentation']:.1%} -> "
+            f"{after['external_fragmentation']:.1%}"
+        )
+
+    def _touch(self, *nodes):
+        if not self.snapshots:
+            return
+        saved = self.snapshots[-1].nodes
+        for node in nodes:
+            if id(node) in saved:
+                continue
+            state = dict(vars(node))
+            for key in ("files", "subdirectories", "_blocks"):
+                if key in state:
+                    state[key] = state[key].copy()
+            saved[id(node)] = (node, state)
+
+    def _track_file_id(self, file_id):
+        if self.snapshots:
+            self.snapshots[-1].file_ids.setdefault(
+                file_id, self.files_by_id.get(file_id)
+            )
+
+    def _preserve_block(self, block):
+        saved = self.snapshots[-1].blocks
+        if block not in saved:
+            saved[block] = self.store.capture(block)
+
+    def snapshot(self):
+        self._log("snapshot")
+        # Escritas pendentes no cache pertencem ao estado anterior ao snapshot.
+        self.cache.sync()
+        snapshot = Snapshot(
+            self.next_snapshot_id, self.next_file_id, self.current_directory
+        )
+        self.next_snapshot_id += 1
+        self.snapshots.append(snapshot)
+        self.store.on_write = self._preserve_block
+        return snapshot.id
+
+    def _snapshot_index(self, snapshot_id):
+        for index, snapshot in enumerate(self.snapshots):
+            if snapshot.id == snapshot_id:
+                return index
+        return None
+
+    def rollback(self, snapshot_id=None):
+        self._log("rollback", snapshot_id)
+        if not self.snapshots:
+            print("Erro: Nenhum snapshot disponível!")
+            return False
+        index = len(self.snapshots) - 1
+        if snapshot_id is not None:
+            index = self._snapshot_index(snapshot_id)
+            if index is None:
+                print("Erro: Snapshot não encontrado!")
+                return False
+
+        self.cache.invalidate()
+        self.store.on_write = None
+        moved = []
+        for snapshot in reversed(self.snapshots[index:]):
+            self._restore(snapshot, moved)
+        for directory in moved:
+            for _, node in self._walk(directory):
+                if isinstance(node, Directory):
+                    node._path = None
+
+        target = self.snapshots[index]
+        del self.snapshots[index + 1 :]
+        target.reset()
+        self.next_file_id = target.next_file_id
+        self.current_directory = target.current_directory
+        self.dentries.clear()
+        self.defrag_pending = None
+        self.store.on_write = self._preserve_block
+        print(f"Estado restaurado para o snapshot {target.id}.")
+        return True
+
+    def _restore(self, snapshot, moved):
+        to_take, to_release = [], []
+        for block, state in snapshot.blocks.items():
+            was_free = self.store.owners[block] == FREE
+            self.store.restore(block, state)
+            if was_free and state[0] != FREE:
+                to_take.append(block)
+            elif not was_free and state[0] == FREE:
+                to_release.append(block)
+        self.free_space.release(to_release)
+        self.free_space.take(to_take)
+
+        for node, state in snapshot.nodes.values():
+            if isinstance(node, Directory) and (
+                node.name != state["name"] or node.parent is not state["parent"]
+            ):
+                moved.append(node)
+            vars(node).clear()
+            vars(node).update(state)
+
+        for file_id, file in snapshot.file_ids.items():
+            if file is None:
+                self.files_by_id.pop(file_id, None)
+            else:
+                self.files_by_id[file_id] = file
+
+    def drop_snapshot(self, snapshot_id):
+        self._log("dropsnap", snapshot_id)
+        index = self._snapshot_index(snapshot_id)
+        if index is None:
+            print("Erro: Snapshot não encontrado!")
+            return False
+        snapshot = self.snapshots.pop(index)
+        if index > 0:
+            snapshot.merge_into(self.snapshots[index - 1])
+        if not self.snapshots:
+            self.store.on_write = None
+        print(f"Snapshot {snapshot_id} descartado.")
+        return True
+
+    def snapshot_stats(self):
+        return [snapshot.overhead() for snapshot in self.snapshots]
+
+    def show_snapshot(self):
+        snapshot_id = self.snapshot()
+        print(f"Snapshot {snapshot_id} criado.")
+
+    def show_snapshots(self):
+        if not self.snapshots:
+            print("Nenhum snapshot.")
+        for stats in self.snapshot_stats():
+            print(
+                f"Snapshot {stats['id']}: {stats['preserved_blocks']} blocos e "
+                f"{stats['preserved_nodes']} nós preservados, "
+                f"~{stats['bytes']} bytes"
+            )
 
     def show_allocation(self):
         print("Estado da memória:")
-        for i, block in enumerate(self.memory):
-            if block:
+        for i in range(self.total_blocks):
+            owner = self.store.owners[i]
+            if owner != FREE:
+                block = {self.files_by_id[owner].name: self.store.used[i]}
                 next_block = (
-                    self.block_links[i] if self.block_links[i] != -1 else "None"
+                    self.store.links[i] if self.store.links[i] != -1 else "None"
                 )
                 print(f"Bloco {i}: {block}, Próximo: {next_block}")
             else:
                 print(f"Bloco {i}: Vazio")
 
-    def change_directory(self, name):
-        if name == "..":
-            if self.current_directory.parent:
-                self.current_directory = self.current_directory.parent
-        elif name in self.current_directory.subdirectories:
-            self.current_directory = self.current_directory.subdirectories[name]
+    def change_directory(self, path):
+        directory = self.resolve(path)
+        if isinstance(directory, Directory):
+            self.current_directory = directory
         else:
             print("Erro: Diretório não encontrado!")
 
     def clear_screen(self):
         os.system("cls" if os.name == "nt" else "clear")
 
-    def show_tree(self, directory=None, indent="  "):
-        if directory is None:
-            directory = self.root
-
-        print(indent + ("/" if directory.name == "/" else directory.name + "/"))
-        for subdir in directory.subdirectories.values():
-            self.show_tree(subdir, indent + "  ")
-        for file in directory.files.values():
-            print(indent + "  " + file.name)
+    def show_tree(self, path="/"):
+        lines = []
+        for depth, node in self.walk(path):
+            indent = "  " * (depth + 1)
+            if isinstance(node, File):
+                lines.append(indent + node.name)
+            else:
+                lines.append(indent + ("/" if node.parent is None else node.name + "/"))
+            if len(lines) == 1024:
+                print("\n".join(lines))
+                lines.clear()
+        if lines:
+            print("\n".join(lines))
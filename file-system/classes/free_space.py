@@ -0,0 +1,157 @@
+import bisect
+import itertools
+import random
+from collections import Counter
+
+
+def block_ranges(blocks):
+    start = previous = None
+    for block in blocks:
+        if start is None:
+            start = previous = block
+        elif block == previous + 1:
+            previous = block
+        else:
+            yield start, previous - start + 1
+            start = previous = block
+    if start is not None:
+        yield start, previous - start + 1
+
+
+class FreeSpaceMap:
+    def __init__(self, total_blocks, bitmap=None, before_write=None):
+        self.total_blocks = total_blocks
+        self.before_write = before_write
+        self.run_starts = []
+        self.run_lengths = {}
+        self.length_counts = Counter()
+        if bitmap is None:
+            self.bitmap = bytearray(total_blocks)
+            self.free_count = total_blocks
+            if total_blocks:
+                self._insert_run(0, 0, total_blocks)
+        else:
+            self.bitmap = bitmap
+            self._rebuild_runs()
+
+    def _rebuild_runs(self):
+        snapshot = bytes(self.bitmap)
+        self.free_count = 0
+        start = snapshot.find(0)
+        while start != -1:
+            end = snapshot.find(1, start)
+            if end == -1:
+                end = self.total_blocks
+            self._insert_run(len(self.run_starts), start, end - start)
+            self.free_count += end - start
+            start = snapshot.find(0, end)
+
+    def _insert_run(self, index, start, length):
+        self.run_starts.insert(index, start)
+        self.run_lengths[start] = length
+        self.length_counts[length] += 1
+
+    def _delete_run(self, index):
+        start = self.run_starts.pop(index)
+        length = self.run_lengths.pop(start)
+        self.length_counts[length] -= 1
+        if not self.length_counts[length]:
+            del self.length_counts[length]
+        return start, length
+
+    @property
+    def used_count(self):
+        return self.total_blocks - self.free_count
+
+    def is_free(self, block):
+        return not self.bitmap[block]
+
+    def runs(self):
+        for start in self.run_starts:
+            yield start, self.run_lengths[start]
+
+    def largest_run(self):
+        return max(self.length_counts, default=0)
+
+    def histogram(self):
+        buckets = Counter()
+        for length, count in self.length_counts.items():
+            buckets[1 << (length.bit_length() - 1)] += count
+        return dict(sorted(buckets.items()))
+
+    def take(self, blocks):
+        for start, length in block_ranges(sorted(blocks)):
+            self.take_range(start, length)
+
+    def release(self, blocks):
+        for start, length in block_ranges(sorted(blocks)):
+            self.release_range(start, length)
+
+    def take_range(self, start, length):
+        index = bisect.bisect_right(self.run_starts, start) - 1
+        run_start = self.run_starts[index] if index >= 0 else None
+        if (
+            run_start is None
+            or start + length > run_start + self.run_lengths[run_start]
+        ):
+            raise ValueError(f"Blocos {start}..{start + length - 1} não estão livres")
+
+        run_start, run_length = self._delete_run(index)
+        run_end = run_start + run_length
+        if run_start < start:
+            self._insert_run(index, run_start, start - run_start)
+            index += 1
+        if start + length < run_end:
+            self._insert_run(index, start + length, run_end - start - length)
+
+        if self.before_write is not None:
+            self.before_write(start, length)
+        self.bitmap[start : start + length] = b"\x01" * length
+        self.free_count -= length
+
+    def release_range(self, start, length):
+        if bytes(self.bitmap[start : start + length]).find(0) != -1:
+            raise ValueError(f"Blocos {start}..{start + length - 1} já estão livres")
+
+        if self.before_write is not None:
+            self.before_write(start, length)
+        self.bitmap[start : start + length] = bytes(length)
+        self.free_count += length
+
+        index = bisect.bisect_left(self.run_starts, start)
+        end = start + length
+        if index > 0:
+            previous = self.run_starts[index - 1]
+            if previous + self.run_lengths[previous] == start:
+                index -= 1
+                start, _ = self._delete_run(index)
+        if index < len(self.run_starts) and self.run_starts[index] == end:
+            _, next_length = self._delete_run(index)
+            end += next_length
+
+        self._insert_run(index, start, end - start)
+
+    def sample(self, count, rng=random):
+        if count > self.free_count:
+            raise ValueError("Espaço insuficiente")
+
+        # Com bastante espaço livre, sortear blocos e descartar os ocupados
+        # custa O(count); perto do disco cheio, sortear posições entre os
+        # blocos livres e mapeá-las para os trechos livres custa O(trechos).
+        if self.free_count * 4 >= self.total_blocks and count * 2 <= self.free_count:
+            chosen = set()
+            while len(chosen) < count:
+                block = rng.randrange(self.total_blocks)
+                if not self.bitmap[block]:
+                    chosen.add(block)
+            return list(chosen)
+
+        offsets = list(
+            itertools.accumulate(self.run_lengths[start] for start in self.run_starts)
+        )
+        chosen = []
+        for rank in rng.sample(range(self.free_count), count):
+            index = bisect.bisect_right(offsets, rank)
+            run_offset = offsets[index - 1] if index else 0
+            chosen.append(self.run_starts[index] + rank - run_offset)
+        return chosen
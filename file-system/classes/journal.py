@@ -0,0 +1,134 @@
+import base64
+import json
+import os
+import threading
+import time
+
+REPLAY = {
+    "touch": lambda fs, path, size: fs.create_file(path, size),
+    "rm": lambda fs, path: fs.delete_file(path),
+    "write": lambda fs, path, offset, data: fs.write_file(
+        path, offset, base64.b64decode(data)
+    ),
+    "append": lambda fs, path, data: fs.append_file(path, base64.b64decode(data)),
+    "mkdir": lambda fs, path: fs.create_directory(path),
+    "rmdir": lambda fs, path, recursive: fs.delete_directory(path, recursive),
+    "cp": lambda fs, source, destination, recursive: fs.copy(
+        source, destination, recursive
+    ),
+    "mv": lambda fs, source, destination: fs.move(source, destination),
+    "strategy": lambda fs, name: fs.set_strategy(name),
+    "defrag": lambda fs, budget: fs.defragment(budget),
+    "snapshot": lambda fs: fs.snapshot(),
+    "rollback": lambda fs, snapshot_id: fs.rollback(snapshot_id),
+    "dropsnap": lambda fs, snapshot_id: fs.drop_snapshot(snapshot_id),
+}
+
+
+# Journal lógico de operações, escrito antes de aplicá-las (write-ahead).
+# Cada linha é um registro JSON [operação, diretório atual, argumentos...];
+# a primeira linha guarda a configuração e o estado do gerador aleatório
+# para que a repetição reproduza exatamente a mesma alocação de blocos.
+# O fsync é feito em grupo: a cada group_size registros ou quando o
+# registro pendente mais antigo passa de group_delay segundos. Um timer
+# garante o prazo mesmo sem novas operações, como numa sessão interativa
+# parada no prompt.
+class Journal:
+    def __init__(self, path, header, group_size=64, group_delay=0.05):
+        self.path = path
+        self.group_size = group_size
+        self.group_delay = group_delay
+        self.pending = 0
+        self.oldest_pending = None
+        self.commits = 0
+        self.timer = None
+        self.lock = threading.Lock()
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self.file = open(path, "ab")
+        if not exists:
+            self._write({"header": header})
+            self.commit()
+
+    @staticmethod
+    def read(path):
+        header = None
+        records = []
+        with open(path, "rb") as journal:
+            for line in journal:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break  # registro incompleto deixado por uma queda
+                if isinstance(record, dict):
+                    header = record["header"]
+                else:
+                    records.append(record)
+        return header, records
+
+    def _write(self, record):
+        self.file.write(json.dumps(record, separators=(",", ":")).encode() + b"\n")
+
+    def log(self, op, *args):
+        with self.lock:
+            self._write([op, *args])
+            self.pending += 1
+            now = time.monotonic()
+            if self.oldest_pending is None:
+                self.oldest_pending = now
+            if (
+                self.pending >= self.group_size
+                or now - self.oldest_pending >= self.group_delay
+            ):
+                self._commit()
+            elif self.timer is None:
+                self.timer = threading.Timer(self.group_delay, self._commit_due)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def _commit_due(self):
+        with self.lock:
+            self.timer = None
+            if self.pending and not self.file.closed:
+                self._commit()
+
+    def commit(self):
+        with self.lock:
+            self._commit()
+
+    def _commit(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.pending = 0
+        self.oldest_pending = None
+        self.commits += 1
+
+    def checkpoint(self, header):
+        with self.lock:
+            self.file.close()
+            self.file = open(self.path, "wb")
+            self._write({"header": header})
+            self._commit()
+
+    def close(self):
+        with self.lock:
+            if self.pending:
+                self._commit()
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            self.file.close()
+
+
+def encode_data(data):
+    return base64.b64encode(data).decode()
+
+
+def replay(fs, records):
+    for op, cwd, *args in records:
+        directory = fs.resolve(cwd)
+        fs.current_directory = directory if directory is not None else fs.root
+        REPLAY[op](fs, *args)
+    return len(records)
@@ -0,0 +1,43 @@
+import threading
+from contextlib import contextmanager
+
+
+# Trava de leitores e escritor. Operações restritas a poucos diretórios
+# compartilham a árvore; as que a percorrem ou reorganizam inteira (rmdir,
+# mv de diretório, desfragmentação, snapshots) a recebem com exclusividade.
+# Um escritor esperando impede a entrada de novos leitores.
+class SharedLock:
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.readers = 0
+        self.writer = False
+        self.waiting_writers = 0
+
+    @contextmanager
+    def shared(self):
+        with self.condition:
+            while self.writer or self.waiting_writers:
+                self.condition.wait()
+            self.readers += 1
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.readers -= 1
+                if not self.readers:
+                    self.condition.notify_all()
+
+    @contextmanager
+    def exclusive(self):
+        with self.condition:
+            self.waiting_writers += 1
+            while self.writer or self.readers:
+                self.condition.wait()
+            self.waiting_writers -= 1
+            self.writer = True
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.writer = False
+                self.condition.notify_all()
@@ -0,0 +1,136 @@
+import contextlib
+
+from classes.directory import Directory
+
+
+# Sessão de um cliente concorrente: tem o próprio diretório atual e traduz
+# caminhos relativos para absolutos antes de chamar o FileSystem, que nunca
+# usa o diretório atual global. Cada operação segura a árvore em modo
+# compartilhado e trava só os diretórios que altera, sempre em ordem de id
+# para evitar deadlock; blocos e cache ficam sob a allocator_lock. Com
+# várias sessões, o journal registra as operações na ordem de chegada e a
+# repetição só reproduz exatamente a alocação de uma sessão única.
+class Session:
+    def __init__(self, fs):
+        self.fs = fs
+        self.current_directory = fs.root
+
+    def _absolute(self, path):
+        if path.startswith("/"):
+            return path
+        return f"{self.current_directory.get_path().rstrip('/')}/{path}"
+
+    def _parent(self, path):
+        return self.fs._resolve_parent(path)[0]
+
+    def _target_directory(self, path):
+        # Não consulta o último componente no cache de dentries: ele só pode
+        # ser resolvido com o diretório pai travado.
+        parent, name = self.fs._resolve_parent(path)
+        if parent is None:
+            return self.fs.resolve(path)
+        return parent.subdirectories.get(name, parent)
+
+    @contextlib.contextmanager
+    def _locked(self, *directories):
+        unique = {id(directory): directory for directory in directories if directory}
+        with contextlib.ExitStack() as stack:
+            for key in sorted(unique):
+                stack.enter_context(unique[key].lock)
+            yield
+
+    def _run(self, method, path, *args):
+        path = self._absolute(path)
+        with self.fs.namespace_lock.shared(), self._locked(self._parent(path)):
+            return method(path, *args)
+
+    def _exclusive(self, method, *args):
+        with self.fs.namespace_lock.exclusive():
+            return method(*args)
+
+    def create_file(self, path, size):
+        return self._run(self.fs.create_file, path, size)
+
+    def delete_file(self, path):
+        return self._run(self.fs.delete_file, path)
+
+    def write_file(self, path, offset, data):
+        return self._run(self.fs.write_file, path, offset, data)
+
+    def append_file(self, path, data):
+        return self._run(self.fs.append_file, path, data)
+
+    def read_file(self, path, offset=0, length=None):
+        return self._run(self.fs.read_file, path, offset, length)
+
+    def create_directory(self, path):
+        return self._run(self.fs.create_directory, path)
+
+    def delete_directory(self, path, recursive=False):
+        path = self._absolute(path)
+        with self.fs.namespace_lock.exclusive():
+            directory = self.fs.resolve(path)
+            if isinstance(directory, Directory) and self.fs._is_within(
+                self.current_directory, directory
+            ):
+                print("Erro: Diretório em uso!")
+                return
+            return self.fs.delete_directory(path, recursive)
+
+    def copy(self, source, destination, recursive=False):
+        source, destination = self._absolute(source), self._absolute(destination)
+        if recursive:
+            return self._exclusive(self.fs.copy, source, destination, recursive)
+        with self.fs.namespace_lock.shared(), self._locked(
+            self._parent(source), self._target_directory(destination)
+        ):
+            return self.fs.copy(source, destination)
+
+    def move(self, source, destination):
+        source, destination = self._absolute(source), self._absolute(destination)
+        with self.fs.namespace_lock.shared():
+            parent, name = self.fs._resolve_parent(source)
+            if parent is None or name not in parent.subdirectories:
+                with self._locked(parent, self._target_directory(destination)):
+                    return self.fs.move(source, destination)
+        # Mover um diretório muda o caminho de toda a subárvore.
+        return self._exclusive(self.fs.move, source, destination)
+
+    def list_entries(self, path=".", pattern=None, sort=False, offset=0, limit=None):
+        path = self._absolute(path)
+        with self.fs.namespace_lock.shared(), self._locked(
+            self._target_directory(path)
+        ):
+            # O iterador do FileSystem percorre o diretório sob demanda: a
+            # lista é montada ainda com as travas.
+            entries = self.fs.list_entries(path, pattern, sort, offset, limit)
+            return None if entries is None else list(entries)
+
+    def change_directory(self, path):
+        with self.fs.namespace_lock.shared():
+            directory = self.fs.resolve(self._absolute(path))
+        if isinstance(directory, Directory):
+            self.current_directory = directory
+        else:
+            print("Erro: Diretório não encontrado!")
+
+    def set_strategy(self, name):
+        return self._exclusive(self.fs.set_strategy, name)
+
+    def defragment(self, budget=None):
+        return self._exclusive(self.fs.defragment, budget)
+
+    def snapshot(self):
+        return self._exclusive(self.fs.snapshot)
+
+    def rollback(self, snapshot_id=None):
+        return self._exclusive(self.fs.rollback, snapshot_id)
+
+    def drop_snapshot(self, snapshot_id):
+        return self._exclusive(self.fs.drop_snapshot, snapshot_id)
+
+    def allocation_stats(self):
+        return self._exclusive(self.fs.allocation_stats)
+
+    def sync(self):
+        return self._exclusive(self.fs.sync)
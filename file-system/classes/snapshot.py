@@ -0,0 +1,42 @@
+import sys
+import time
+
+
+class Snapshot:
+    def __init__(self, snapshot_id, next_file_id, current_directory):
+        self.id = snapshot_id
+        self.created = time.time()
+        self.next_file_id = next_file_id
+        self.current_directory = current_directory
+        self.reset()
+
+    def reset(self):
+        self.blocks = {}
+        self.nodes = {}
+        self.file_ids = {}
+
+    def merge_into(self, older):
+        for block, state in self.blocks.items():
+            older.blocks.setdefault(block, state)
+        for key, saved in self.nodes.items():
+            older.nodes.setdefault(key, saved)
+        for file_id, file in self.file_ids.items():
+            older.file_ids.setdefault(file_id, file)
+
+    def overhead(self):
+        block_bytes = sum(
+            16 + (len(data) if data is not None else 0)
+            for _, _, _, data in self.blocks.values()
+        )
+        node_bytes = sum(
+            sys.getsizeof(state) + sum(map(sys.getsizeof, state.values()))
+            for _, state in self.nodes.values()
+        )
+        return {
+            "id": self.id,
+            "created": self.created,
+            "preserved_blocks": len(self.blocks),
+            "preserved_nodes": len(self.nodes),
+            "preserved_file_ids": len(self.file_ids),
+            "bytes": block_bytes + node_bytes + 16 * len(self.file_ids),
+        }
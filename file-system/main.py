@@ -1,41 +1,231 @@
+import argparse
+import contextlib
+import os
+import sys
+import time
+from collections import defaultdict
+
 from classes.file_system import FileSystem
+from classes.journal import Journal, replay
 
 
-def main():
-    total_blocks = 20
-    block_size = 4
-    fs = FileSystem(total_blocks, block_size)
-
-    while True:
-        command = input(f"{fs.current_directory.get_path()} $ ").strip().split()
-        if not command:
-            continue
-
-        cmd = command[0]
-        args = command[1:]
-
-        if cmd == "mkdir" and args:
-            fs.create_directory(args[0])
-        elif cmd == "rmdir" and args:
-            fs.delete_directory(args[0])
-        elif cmd == "touch" and len(args) == 2:
-            fs.create_file(args[0], int(args[1]))
-        elif cmd == "rm" and args:
-            fs.delete_file(args[0])
-        elif cmd == "ls":
-            fs.list_directory()
-        elif cmd == "alloc":
-            fs.show_allocation()
-        elif cmd == "cd" and args:
-            fs.change_directory(args[0])
-        elif cmd == "clear":
-            fs.clear_screen()
-        elif cmd == "tree":
-            fs.show_tree()
-        elif cmd == "exit":
-            break
+def list_directory(fs, args):
+    options = {"path": ".", "pattern": None, "sort": False, "page": 1}
+    args = iter(args)
+    for arg in args:
+        if arg == "-s":
+            options["sort"] = True
+        elif arg == "-p":
+            options["page"] = int(next(args, 1))
+        elif arg == "-n":
+            options["page_size"] = int(next(args, 100))
+        elif arg == "-g":
+            options["pattern"] = next(args, None)
         else:
-            print("Comando não reconhecido.")
+            options["path"] = arg
+    fs.list_directory(**options)
+
+
+def execute(fs, command):
+    cmd = command[0]
+    args = command[1:]
+
+    if cmd == "mkdir" and args:
+        fs.create_directory(args[0])
+    elif cmd == "rmdir" and args:
+        fs.delete_directory(args[0])
+    elif cmd == "touch" and len(args) == 2:
+        fs.create_file(args[0], int(args[1]))
+    elif cmd == "rm" and args[:1] == ["-r"] and len(args) == 2:
+        fs.delete_directory(args[1], recursive=True)
+    elif cmd == "rm" and args:
+        fs.delete_file(args[0])
+    elif cmd == "cp" and args[:1] == ["-r"] and len(args) == 3:
+        fs.copy(args[1], args[2], recursive=True)
+    elif cmd == "cp" and len(args) == 2:
+        fs.copy(args[0], args[1])
+    elif cmd == "mv" and len(args) == 2:
+        fs.move(args[0], args[1])
+    elif cmd == "write" and len(args) >= 3:
+        fs.write_file(args[0], int(args[1]), " ".join(args[2:]).encode())
+    elif cmd == "append" and len(args) >= 2:
+        fs.append_file(args[0], " ".join(args[1:]).encode())
+    elif cmd == "cat" and args:
+        fs.show_file(args[0], *map(int, args[1:3]))
+    elif cmd == "cache":
+        fs.show_cache_stats()
+    elif cmd == "ls":
+        list_directory(fs, args)
+    elif cmd == "alloc":
+        fs.show_allocation()
+    elif cmd == "df":
+        fs.show_disk_usage()
+    elif cmd == "stats":
+        fs.show_allocation_stats()
+    elif cmd == "defrag":
+        fs.show_defragment(*map(int, args[:1]))
+    elif cmd == "strategy" and args:
+        fs.set_strategy(args[0])
+    elif cmd == "seeks" and args:
+        fs.show_read_seeks(args[0])
+    elif cmd == "cd" and args:
+        fs.change_directory(args[0])
+    elif cmd == "clear":
+        fs.clear_screen()
+    elif cmd == "tree":
+        fs.show_tree(*args[:1])
+    elif cmd == "snapshot" and args[:1] == ["drop"] and len(args) == 2:
+        fs.drop_snapshot(int(args[1]))
+    elif cmd == "snapshot":
+        fs.show_snapshot()
+    elif cmd == "snapshots":
+        fs.show_snapshots()
+    elif cmd == "rollback":
+        fs.rollback(*map(int, args[:1]))
+    elif cmd == "sync":
+        fs.sync()
+    elif cmd == "exit":
+        return False
+    else:
+        print("Comando não reconhecido.")
+    return True
+
+
+def percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+def print_summary(latencies, elapsed, errors=0):
+    total = sum(len(samples) for samples in latencies.values())
+    rate = total / elapsed if elapsed else float("inf")
+    print(f"\n{total} operações em {elapsed:.3f}s ({rate:.0f} ops/s)")
+    if errors:
+        print(f"{errors} linha(s) com argumentos inválidos ignorada(s)")
+    print(
+        f"{'Comando':<10} {'Qtd':>9} {'p50 (µs)':>10} {'p90 (µs)':>10} "
+        f"{'p99 (µs)':>10} {'máx (µs)':>10}"
+    )
+    for cmd, samples in sorted(latencies.items()):
+        samples.sort()
+        print(
+            f"{cmd:<10} {len(samples):>9} "
+            f"{percentile(samples, 0.5) * 1e6:>10.1f} "
+            f"{percentile(samples, 0.9) * 1e6:>10.1f} "
+            f"{percentile(samples, 0.99) * 1e6:>10.1f} "
+            f"{samples[-1] * 1e6:>10.1f}"
+        )
+
+
+def run_script(fs, lines, quiet):
+    latencies = defaultdict(list)
+    errors = 0
+    if quiet:
+        output = open(os.devnull, "w")
+    else:
+        output = open(sys.stdout.fileno(), "w", buffering=1 << 20, closefd=False)
+
+    start = time.perf_counter()
+    with output, contextlib.redirect_stdout(output):
+        for number, line in enumerate(lines, 1):
+            command = line.split()
+            if not command or command[0].startswith("#"):
+                continue
+            before = time.perf_counter()
+            # Um argumento numérico inválido descarta só a linha, e não o
+            # resto de um trace longo.
+            try:
+                running = execute(fs, command)
+            except ValueError:
+                errors += 1
+                print(f"Erro: Argumento inválido na linha {number}: {line.strip()}")
+                continue
+            latencies[command[0]].append(time.perf_counter() - before)
+            if not running:
+                break
+    elapsed = time.perf_counter() - start
+
+    print_summary(latencies, elapsed, errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulador de sistema de arquivos")
+    parser.add_argument("--blocks", type=int, default=20)
+    parser.add_argument("--block-size", type=int, default=4)
+    parser.add_argument(
+        "--image", help="imagem de disco persistente (criada se não existir)"
+    )
+    parser.add_argument(
+        "--script", help="arquivo de comandos para executar em lote ('-' para stdin)"
+    )
+    parser.add_argument(
+        "--quiet", action="store_true", help="descarta a saída dos comandos em lote"
+    )
+    parser.add_argument(
+        "--journal", help="journal de operações, repetido ao iniciar se existir"
+    )
+    parser.add_argument(
+        "--group-commit",
+        type=int,
+        default=64,
+        help="registros do journal por fsync (1 = fsync a cada operação)",
+    )
+    options = parser.parse_args()
+
+    header, records = None, []
+    if options.journal is not None and os.path.exists(options.journal):
+        header, records = Journal.read(options.journal)
+
+    if options.image is None and header is not None:
+        fs = FileSystem(
+            header["total_blocks"], header["block_size"], header["strategy"]
+        )
+    elif options.image is None:
+        fs = FileSystem(options.blocks, options.block_size)
+    elif os.path.exists(options.image):
+        fs = FileSystem.mount(options.image)
+    else:
+        fs = FileSystem.format(options.image, options.blocks, options.block_size)
+
+    # A imagem foi gravada depois do último checkpoint do journal: os
+    # registros já estão nela e o journal recomeça do estado atual.
+    stale = header is not None and header.get("generation", 0) < fs.generation
+    if stale:
+        header, records = None, []
+
+    if options.journal is not None:
+        if header is not None:
+            fs.restore_rng(header)
+            with open(os.devnull, "w") as devnull:
+                with contextlib.redirect_stdout(devnull):
+                    replay(fs, records)
+            print(f"{len(records)} operações recuperadas do journal.")
+        fs.attach_journal(
+            Journal(options.journal, fs.journal_header(), options.group_commit)
+        )
+        if stale:
+            fs.journal.checkpoint(fs.journal_header())
+
+    # Ctrl-C, Ctrl-D ou um erro também gravam a imagem e o journal.
+    try:
+        if options.script is not None:
+            if options.script == "-":
+                run_script(fs, sys.stdin, options.quiet)
+            else:
+                with open(options.script) as script:
+                    run_script(fs, script, options.quiet)
+            return
+
+        while True:
+            try:
+                line = input(f"{fs.current_directory.get_path()} $ ")
+            except (EOFError, KeyboardInterrupt):
+                print()
+                break
+            command = line.strip().split()
+            if command and not execute(fs, command):
+                break
+    finally:
+        fs.unmount()
 
 
 if __name__ == "__main__":
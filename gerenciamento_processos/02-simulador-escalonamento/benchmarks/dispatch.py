@@ -0,0 +1,118 @@
+import argparse
+from pathlib import Path
+import sys
+import time
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from main import FilaFIFO, FilaPrioridade, gerar_processos
+
+
+# Laços de despacho do escalonador, sem impressão nem sleep: a versão antiga
+# com lista (pop(0) e ordenação a cada iteração) e a nova com as filas.
+def fifo_lista(processos):
+    fila = processos[:]
+    while fila:
+        fila.pop(0)
+
+
+def fifo_fila(processos):
+    fila = FilaFIFO(processos)
+    while fila:
+        fila.remover()
+
+
+def rr_lista(processos, quantum):
+    restante = {processo.pid: processo.tempo_cpu for processo in processos}
+    fila = processos[:]
+    while fila:
+        processo = fila.pop(0)
+        restante[processo.pid] -= min(quantum, restante[processo.pid])
+        if restante[processo.pid] > 0:
+            fila.append(processo)
+
+
+def rr_fila(processos, quantum):
+    restante = {processo.pid: processo.tempo_cpu for processo in processos}
+    fila = FilaFIFO(processos)
+    while fila:
+        processo = fila.remover()
+        restante[processo.pid] -= min(quantum, restante[processo.pid])
+        if restante[processo.pid] > 0:
+            fila.inserir(processo)
+
+
+def prioridade_lista(processos):
+    fila = processos[:]
+    ordem = []
+    while fila:
+        fila.sort(key=lambda p: p.prioridade)
+        ordem.append(fila.pop(0).pid)
+    return ordem
+
+
+def prioridade_fila(processos):
+    fila = FilaPrioridade(processos)
+    ordem = []
+    while fila:
+        ordem.append(fila.remover().pid)
+    return ordem
+
+
+def medir(funcao, *args):
+    inicio = time.perf_counter()
+    funcao(*args)
+    return time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Custo de despacho das filas de prontos do escalonador."
+    )
+    parser.add_argument(
+        "--quantidades",
+        type=int,
+        nargs="+",
+        default=[1_000, 10_000, 100_000, 1_000_000],
+    )
+    parser.add_argument(
+        "--max-lista",
+        type=int,
+        default=10_000,
+        help="maior quantidade medida com a lista antiga (a prioridade é quadrática)",
+    )
+    parser.add_argument("--quantum", type=int, default=4)
+    parser.add_argument("--semente", type=int, default=0)
+    config = parser.parse_args()
+
+    # Sanidade: as duas versões despacham na mesma ordem, inclusive empates.
+    amostra = gerar_processos(2_000, config.semente)
+    assert prioridade_lista(amostra) == prioridade_fila(amostra)
+
+    print(
+        f"{'Algoritmo':<11} {'Processos':>10} {'lista (s)':>10} {'fila (s)':>9} "
+        f"{'µs/despacho':>12} {'ganho':>8}"
+    )
+    for quantidade in config.quantidades:
+        processos = gerar_processos(quantidade, config.semente)
+        for nome, antiga, nova, args in (
+            ("FIFO", fifo_lista, fifo_fila, ()),
+            ("RR", rr_lista, rr_fila, (config.quantum,)),
+            ("PRIORIDADE", prioridade_lista, prioridade_fila, ()),
+        ):
+            novo = medir(nova, processos, *args)
+            if quantidade <= config.max_lista:
+                antigo = medir(antiga, processos, *args)
+                colunas = f"{antigo:>10.3f} {novo:>9.3f}"
+                ganho = f"{antigo / novo:>7.1f}x"
+            else:
+                colunas = f"{'-':>10} {novo:>9.3f}"
+                ganho = f"{'-':>8}"
+            print(
+                f"{nome:<11} {quantidade:>10} {colunas} "
+                f"{novo / quantidade * 1e6:>12.3f} {ganho}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import os
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from main import Escalonador, gerar_processos
+
+
+def simular(processos, algoritmo, quantum, rastro, arquivo_eventos):
+    escalonador = Escalonador(quantum, True, rastro, arquivo_eventos)
+    for processo in processos:
+        escalonador.adicionar_processo(processo)
+    inicio = time.perf_counter()
+    with open(os.devnull, "w") as devnull:
+        saida, sys.stdout = sys.stdout, devnull
+        try:
+            escalonador.escalonar(algoritmo)
+        finally:
+            sys.stdout = saida
+    return time.perf_counter() - inicio, escalonador
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Tempo de parede do escalonador em modo headless."
+    )
+    parser.add_argument(
+        "--quantidades", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--quantum", type=int, default=4)
+    parser.add_argument("--semente", type=int, default=0)
+    config = parser.parse_args()
+
+    print(
+        f"{'Algoritmo':<11} {'Processos':>10} {'Modo':<16} {'Tempo (s)':>10} "
+        f"{'eventos/s':>11}"
+    )
+    with tempfile.TemporaryDirectory() as diretorio:
+        arquivo = os.path.join(diretorio, "eventos.csv")
+        for quantidade in config.quantidades:
+            for algoritmo in ("FIFO", "RR", "PRIORIDADE"):
+                for modo, rastro, arquivo_eventos in (
+                    ("só métricas", False, None),
+                    ("rastro", True, None),
+                    ("arquivo", False, arquivo),
+                ):
+                    processos = gerar_processos(quantidade, config.semente)
+                    tempo, escalonador = simular(
+                        processos, algoritmo, config.quantum, rastro, arquivo_eventos
+                    )
+                    # Um evento por fatia executada e um por processo finalizado.
+                    eventos = sum(
+                        -(-processo.tempo_cpu // config.quantum)
+                        if algoritmo == "RR"
+                        else 1
+                        for processo in processos
+                    ) + len(processos)
+                    if rastro:
+                        assert len(escalonador.rastro) == eventos
+                    print(
+                        f"{algoritmo:<11} {quantidade:>10} {modo:<16} {tempo:>10.3f} "
+                        f"{eventos / tempo:>11.0f}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
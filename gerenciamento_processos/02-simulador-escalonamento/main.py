@@ -1,4 +1,8 @@
+import argparse
+import heapq
+import random
 import time
+from collections import deque
 
 
 class Processo:
@@ -16,130 +20,253 @@ class Processo:
         return f"ID: {self.pid}, Nome: {self.nome}, Prioridade: {self.prioridade}, Tipo: {self.tipo}, Tempo CPU: {self.tempo_cpu}, Tempo Restante: {self.tempo_restante}"
 
 
+# Filas de prontos com a mesma interface (inserir, remover, len, iteração em
+# ordem de execução). A FIFO usa deque, O(1) nas duas pontas; a de prioridade
+# usa heap, O(log n), com um contador de chegada que desempata prioridades
+# iguais na ordem de inserção, como a ordenação estável fazia.
+class FilaFIFO:
+    def __init__(self, processos=()):
+        self._fila = deque(processos)
+
+    def inserir(self, processo):
+        self._fila.append(processo)
+
+    def remover(self):
+        return self._fila.popleft()
+
+    def __len__(self):
+        return len(self._fila)
+
+    def __iter__(self):
+        return iter(self._fila)
+
+
+class FilaPrioridade:
+    def __init__(self, processos=()):
+        self._heap = []
+        self._chegada = 0
+        for processo in processos:
+            self.inserir(processo)
+
+    def inserir(self, processo):
+        heapq.heappush(self._heap, (processo.prioridade, self._chegada, processo))
+        self._chegada += 1
+
+    def remover(self):
+        return heapq.heappop(self._heap)[2]
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __iter__(self):
+        return (processo for _, _, processo in sorted(self._heap))
+
+
+# No modo headless a simulação corre só no relógio simulado: sem sleep e sem
+# imprimir o status a cada despacho. Cada evento vira uma tupla (relógio,
+# evento, pid, duração) no rastro em memória e, se houver arquivo de eventos,
+# uma linha CSV; ao final só as métricas são exibidas.
 class Escalonador:
-    def __init__(self, quantum):
+    def __init__(self, quantum, headless=False, rastro=True, arquivo_eventos=None):
         self.processos = []
         self.quantum = quantum
         self.clock = 0
+        self.headless = headless
+        self.rastro = [] if rastro else None
+        self.arquivo_eventos = arquivo_eventos
+        self._saida_eventos = None
 
     def adicionar_processo(self, processo):
         self.processos.append(processo)
 
     def escalonar(self, algoritmo):
-        if algoritmo == "FIFO":
-            self._escalonamento_fifo()
-        elif algoritmo == "RR":
-            self._escalonamento_rr()
-        elif algoritmo == "PRIORIDADE":
-            self._escalonamento_prioridade()
-        else:
+        if algoritmo not in ("FIFO", "RR", "PRIORIDADE"):
             print("Algoritmo inválido!")
+            return
+        if self.arquivo_eventos is not None:
+            self._saida_eventos = open(self.arquivo_eventos, "w")
+            self._saida_eventos.write("relogio,evento,pid,duracao\n")
+        try:
+            if algoritmo == "FIFO":
+                self._escalonamento_fifo()
+            elif algoritmo == "RR":
+                self._escalonamento_rr()
+            else:
+                self._escalonamento_prioridade()
+        finally:
+            if self._saida_eventos is not None:
+                self._saida_eventos.close()
+                self._saida_eventos = None
 
     def _escalonamento_fifo(self):
-        print("\n[Escalonamento FIFO]")
-        processos_fifo = self.processos[:]
+        self._exibir("\n[Escalonamento FIFO]")
+        processos_fifo = FilaFIFO(self.processos)
         while processos_fifo:
-            processo_atual = processos_fifo.pop(0)
-            print(f"Executando: {processo_atual.nome} (ID: {processo_atual.pid})")
+            processo_atual = processos_fifo.remover()
+            if not self.headless:
+                print(f"Executando: {processo_atual.nome} (ID: {processo_atual.pid})")
             tempo_execucao = processo_atual.tempo_cpu
             self.clock += tempo_execucao
-            processo_atual.turnaround = self.clock
-            processo_atual.tempo_espera = self.clock - processo_atual.tempo_cpu
-            print(f"{processo_atual.nome} finalizou a execução.")
+            self._registrar("execucao", processo_atual, tempo_execucao)
+            self._finalizar(processo_atual)
             self._mostrar_status(processos_fifo)
-            print("\n")
-            time.sleep(2)
+            self._pausar(2)
         self.calcular_tempo_medio()
 
     def _escalonamento_rr(self):
-        print("\n[Escalonamento Round Robin]")
-        fila = self.processos[:]
+        self._exibir("\n[Escalonamento Round Robin]")
+        fila = FilaFIFO(self.processos)
         while fila:
-            processo_atual = fila.pop(0)
+            processo_atual = fila.remover()
             tempo_execucao = min(self.quantum, processo_atual.tempo_restante)
             processo_atual.tempo_restante -= tempo_execucao
             self.clock += tempo_execucao
-            print(
-                f"Tempo: {self.clock}ms, Executando: {processo_atual.nome} por {tempo_execucao}ms"
-            )
+            self._registrar("execucao", processo_atual, tempo_execucao)
+            if not self.headless:
+                print(
+                    f"Tempo: {self.clock}ms, Executando: {processo_atual.nome} por {tempo_execucao}ms"
+                )
             if processo_atual.tempo_restante > 0:
-                fila.append(processo_atual)
+                fila.inserir(processo_atual)
             else:
-                processo_atual.turnaround = self.clock
-                processo_atual.tempo_espera = self.clock - processo_atual.tempo_cpu
-                print(f"{processo_atual.nome} finalizou a execução.")
+                self._finalizar(processo_atual)
             self._mostrar_status(fila)
-            print("\n")
-            time.sleep(1)
+            self._pausar(1)
         self.calcular_tempo_medio()
 
     def _escalonamento_prioridade(self):
-        print("\n[Escalonamento por Prioridade]")
-        processos_prioridade = self.processos[:]
+        self._exibir("\n[Escalonamento por Prioridade]")
+        processos_prioridade = FilaPrioridade(self.processos)
         while processos_prioridade:
-            processos_prioridade.sort(key=lambda p: p.prioridade)
-            processo_atual = processos_prioridade.pop(0)
-            print(
-                f"Executando: {processo_atual.nome} (ID: {processo_atual.pid}, Prioridade: {processo_atual.prioridade})"
-            )
+            processo_atual = processos_prioridade.remover()
+            if not self.headless:
+                print(
+                    f"Executando: {processo_atual.nome} (ID: {processo_atual.pid}, Prioridade: {processo_atual.prioridade})"
+                )
             tempo_execucao = processo_atual.tempo_cpu
             self.clock += tempo_execucao
-            processo_atual.turnaround = self.clock
-            processo_atual.tempo_espera = self.clock - processo_atual.tempo_cpu
-            print(f"{processo_atual.nome} finalizou a execução.")
+            self._registrar("execucao", processo_atual, tempo_execucao)
+            self._finalizar(processo_atual)
             self._mostrar_status(processos_prioridade)
-            print("\n")
-            time.sleep(2)
+            self._pausar(2)
         self.calcular_tempo_medio()
 
+    def _finalizar(self, processo):
+        processo.turnaround = self.clock
+        processo.tempo_espera = self.clock - processo.tempo_cpu
+        self._registrar("fim", processo, 0)
+        self._exibir(f"{processo.nome} finalizou a execução.")
+
+    def _registrar(self, evento, processo, duracao):
+        if self.rastro is not None:
+            self.rastro.append((self.clock, evento, processo.pid, duracao))
+        if self._saida_eventos is not None:
+            self._saida_eventos.write(
+                f"{self.clock},{evento},{processo.pid},{duracao}\n"
+            )
+
+    def _exibir(self, mensagem):
+        if not self.headless:
+            print(mensagem)
+
+    def _pausar(self, segundos):
+        if not self.headless:
+            print("\n")
+            time.sleep(segundos)
+
     def _mostrar_status(self, processos):
+        if self.headless:
+            return
         print(f"Relógio: {self.clock}ms")
         for processo in processos:
             print(processo)
 
-    def calcular_tempo_medio(self):
+    def metricas(self):
+        num_processos = len(self.processos)
+        if num_processos == 0:
+            return None
         total_espera = 0
         total_turnaround = 0
         for processo in self.processos:
             total_espera += processo.tempo_espera
             total_turnaround += processo.turnaround
-        num_processos = len(self.processos)
-        if num_processos > 0:
-            print(f"Tempo Médio de Espera: {total_espera / num_processos}ms")
-            print(f"Tempo Médio de Turnaround: {total_turnaround / num_processos}ms")
+        return {
+            "processos": num_processos,
+            "tempo_total": self.clock,
+            "espera_media": total_espera / num_processos,
+            "turnaround_medio": total_turnaround / num_processos,
+        }
+
+    def calcular_tempo_medio(self):
+        metricas = self.metricas()
+        if metricas is not None:
+            print(f"Tempo Médio de Espera: {metricas['espera_media']}ms")
+            print(f"Tempo Médio de Turnaround: {metricas['turnaround_medio']}ms")
         else:
             print("Nenhum processo foi escalonado.")
 
 
-processos = [
-    Processo(pid=1, nome="Processo 1", prioridade=3, tipo="CPU", tempo_cpu=10),
-    Processo(pid=2, nome="Processo 2", prioridade=2, tipo="I/O", tempo_cpu=5),
-    Processo(pid=3, nome="Processo 3", prioridade=1, tipo="CPU", tempo_cpu=7),
-    Processo(pid=30, nome="Processo 30", prioridade=1, tipo="I/O", tempo_cpu=7),
-    Processo(pid=4, nome="Processo 4", prioridade=4, tipo="I/O", tempo_cpu=6),
-]
-quantum = 4
+def gerar_processos(quantidade, semente=0):
+    aleatorio = random.Random(semente)
+    return [
+        Processo(
+            pid=pid,
+            nome=f"Processo {pid}",
+            prioridade=aleatorio.randint(1, 10),
+            tipo=aleatorio.choice(["CPU", "I/O"]),
+            tempo_cpu=aleatorio.randint(1, 20),
+        )
+        for pid in range(quantidade)
+    ]
 
-print("\n\n===================== FIFO ========================")
-escalonador = Escalonador(quantum)
 
+def main():
+    parser = argparse.ArgumentParser(description="Simulador de escalonamento.")
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="sem sleep nem status a cada despacho; só as métricas finais",
+    )
+    parser.add_argument(
+        "--eventos",
+        help="prefixo dos arquivos CSV de eventos (um por algoritmo)",
+    )
+    parser.add_argument(
+        "--processos", type=int, help="gera N processos aleatórios no lugar do exemplo"
+    )
+    parser.add_argument("--semente", type=int, default=0)
+    config = parser.parse_args()
 
-for processo in processos:
-    escalonador.adicionar_processo(processo)
+    if config.processos is None:
+        processos = [
+            Processo(pid=1, nome="Processo 1", prioridade=3, tipo="CPU", tempo_cpu=10),
+            Processo(pid=2, nome="Processo 2", prioridade=2, tipo="I/O", tempo_cpu=5),
+            Processo(pid=3, nome="Processo 3", prioridade=1, tipo="CPU", tempo_cpu=7),
+            Processo(pid=30, nome="Processo 30", prioridade=1, tipo="I/O", tempo_cpu=7),
+            Processo(pid=4, nome="Processo 4", prioridade=4, tipo="I/O", tempo_cpu=6),
+        ]
+    else:
+        processos = gerar_processos(config.processos, config.semente)
+    quantum = 4
 
-escalonador.escalonar("FIFO")
-
-print("\n\n===================== PRIORIDADE ========================")
-
-escalonador = Escalonador(quantum)
-for processo in processos:
-    escalonador.adicionar_processo(processo)
-
-escalonador.escalonar("PRIORIDADE")
+    for titulo, algoritmo in (
+        ("FIFO", "FIFO"),
+        ("PRIORIDADE", "PRIORIDADE"),
+        ("ROUND ROBIN", "RR"),
+    ):
+        print(f"\n\n===================== {titulo} ========================")
+        arquivo_eventos = None
+        if config.eventos is not None:
+            arquivo_eventos = f"{config.eventos}-{algoritmo.lower()}.csv"
+        # O rastro em memória é para uso programático; a linha de comando só
+        # grava eventos em arquivo, se pedido.
+        escalonador = Escalonador(
+            quantum, config.headless, rastro=False, arquivo_eventos=arquivo_eventos
+        )
+        for processo in processos:
+            escalonador.adicionar_processo(processo)
+        escalonador.escalonar(algoritmo)
 
-print("\n\n===================== ROUND ROBIN ========================")
-escalonador = Escalonador(quantum)
-for processo in processos:
-    escalonador.adicionar_processo(processo)
 
-escalonador.escalonar("RR")
+if __name__ == "__main__":
+    main()
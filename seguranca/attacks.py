@@ -0,0 +1,161 @@
+import collections
+import functools
+import hashlib
+import itertools
+import multiprocessing
+import os
+import signal
+import string
+import time
+
+from encrypt import xor_encrypt
+
+# Geradores de candidatos: todo ataque é só um iterador de senhas, e o mesmo
+# motor (lotes, processos, contagem) serve para qualquer formato de hash.
+
+MASK_CHARSETS = {
+    'l': string.ascii_lowercase,
+    'u': string.ascii_uppercase,
+    'd': string.digits,
+    's': string.punctuation + ' ',
+    'a': string.ascii_letters + string.digits + string.punctuation + ' ',
+}
+
+def read_wordlist(path):
+    with open(path, encoding='utf-8', errors='ignore') as wordlist:
+        for line in wordlist:
+            word = line.rstrip('\r\n')
+            if word:
+                yield word
+
+def mangle(word):
+    # Variações mais comuns de senhas baseadas em palavras.
+    yield word
+    yield word.capitalize()
+    yield word.upper()
+    for digit in string.digits:
+        yield word + digit
+    yield word + '123'
+    yield word.capitalize() + '!'
+
+def dictionary(words, rules=False):
+    if not rules:
+        return iter(words)
+    return itertools.chain.from_iterable(map(mangle, words))
+
+def parse_mask(mask):
+    # ?l ?u ?d ?s ?a como no hashcat; qualquer outro caractere é literal.
+    positions = []
+    chars = iter(mask)
+    for char in chars:
+        if char != '?':
+            positions.append(char)
+            continue
+        name = next(chars, '')
+        if name == '?':
+            positions.append('?')
+        elif name in MASK_CHARSETS:
+            positions.append(MASK_CHARSETS[name])
+        else:
+            raise ValueError(f'Máscara inválida: ?{name}')
+    return positions
+
+def mask_attack(mask):
+    return map(''.join, itertools.product(*parse_mask(mask)))
+
+def mask_size(mask):
+    total = 1
+    for charset in parse_mask(mask):
+        total *= len(charset)
+    return total
+
+def brute_force(alphabet, min_length, max_length):
+    return itertools.chain.from_iterable(
+        map(''.join, itertools.product(alphabet, repeat=length))
+        for length in range(min_length, max_length + 1))
+
+# Formatos: cada um é uma função (parâmetros..., candidato) -> bool, fixada
+# com functools.partial para poder ser enviada aos processos.
+
+def check_xor(encoded_password, candidate):
+    return xor_encrypt(candidate) == encoded_password
+
+def check_sha256(password_hash, candidate):
+    # Formato antigo do Directory.password_hash: SHA-256 sem sal.
+    return hashlib.sha256(candidate.encode()).hexdigest() == password_hash
+
+def check_directory(directory, candidate):
+    # Directory do file-system-encrypt: a própria verificação dele (KDF e
+    # comparação do verificador) é o custo de cada tentativa.
+    return directory.check_password(candidate)
+
+def xor_target(encoded_password):
+    return functools.partial(check_xor, encoded_password)
+
+def sha256_target(password_hash):
+    return functools.partial(check_sha256, password_hash)
+
+def directory_target(directory):
+    return functools.partial(check_directory, directory)
+
+def batches(candidates, size):
+    candidates = iter(candidates)
+    while True:
+        batch = list(itertools.islice(candidates, size))
+        if not batch:
+            return
+        yield batch
+
+def check_batch(check, batch):
+    for position, candidate in enumerate(batch):
+        if check(candidate):
+            return candidate, position + 1
+    return None, len(batch)
+
+_worker_check = None
+
+def _init_worker(check):
+    global _worker_check
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker_check = check
+
+def _check_batch(batch):
+    return check_batch(_worker_check, batch)
+
+def attack(check, candidates, processes=None, batch_size=1_000):
+    # Os lotes são consumidos em ordem, com poucos em voo por processo: o
+    # gerador pode ser infinito na prática e a primeira senha devolvida é a
+    # primeira da sequência de candidatos.
+    processes = processes or os.cpu_count()
+    stats = {'tested': 0, 'elapsed': 0.0, 'rate': 0.0, 'per_core': 0.0,
+             'processes': processes}
+    password = None
+    start = time.perf_counter()
+
+    if processes == 1:
+        for batch in batches(candidates, batch_size):
+            password, tested = check_batch(check, batch)
+            stats['tested'] += tested
+            if password is not None:
+                break
+    else:
+        pending = collections.deque()
+        window = 4 * processes
+        with multiprocessing.Pool(processes, _init_worker, (check,)) as pool:
+            for batch in batches(candidates, batch_size):
+                pending.append(pool.apply_async(_check_batch, (batch,)))
+                if len(pending) < window:
+                    continue
+                password, tested = pending.popleft().get()
+                stats['tested'] += tested
+                if password is not None:
+                    break
+            while pending and password is None:
+                password, tested = pending.popleft().get()
+                stats['tested'] += tested
+
+    stats['elapsed'] = time.perf_counter() - start
+    if stats['elapsed']:
+        stats['rate'] = stats['tested'] / stats['elapsed']
+        stats['per_core'] = stats['rate'] / processes
+    return password, stats
@@ -0,0 +1,103 @@
+import argparse
+import hashlib
+import itertools
+import math
+import os
+from pathlib import Path
+import string
+import sys
+import time
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+sys.path.append(str(Path(__file__).resolve().parents[2] / 'file-system-encrypt'))
+
+from attacks import (attack, brute_force, check_batch, dictionary, directory_target,
+                     mask_attack, mask_size, read_wordlist, sha256_target, xor_target)
+from classes.directory import Directory
+from cracking import solve
+from encrypt import xor_encrypt
+
+# Senha fora de todos os espaços de candidatos: cada ataque testa exatamente o
+# orçamento calculado, que é o pior caso para quem ataca.
+PASSWORD = 'Fora do espaco de busca #1'
+
+def synthetic_words(count):
+    return [f'senha{index}' for index in range(count)]
+
+def targets(config):
+    sha = hashlib.sha256(PASSWORD.encode()).hexdigest()
+    pbkdf2 = Directory('pbkdf2')
+    pbkdf2.set_password(PASSWORD, 'pbkdf2', {'iterations': config.iterations})
+    scrypt = Directory('scrypt')
+    scrypt.set_password(PASSWORD, 'scrypt', {'n': config.scrypt_n, 'r': 8, 'p': 1})
+    return [
+        ('xor_encrypt', xor_target(xor_encrypt(PASSWORD))),
+        ('sha256 (antigo)', sha256_target(sha)),
+        (f'pbkdf2 i={config.iterations}', directory_target(pbkdf2)),
+        (f'scrypt n={config.scrypt_n}', directory_target(scrypt)),
+    ]
+
+def attacks(config):
+    words = (list(read_wordlist(config.wordlist)) if config.wordlist
+             else synthetic_words(100_000))
+    return [
+        ('dicionário+regras', lambda: dictionary(words, rules=True)),
+        (f'máscara {config.mask}', lambda: mask_attack(config.mask)),
+        ('força bruta', lambda: brute_force(string.ascii_lowercase + string.digits, 1, 8)),
+    ]
+
+def single_core_rate(check, seconds):
+    # Estimativa rápida para dimensionar o orçamento de cada medição.
+    tested = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        check_batch(check, ['calibracao'])
+        tested += 1
+    return tested / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Tentativas por segundo por núcleo contra cada formato de senha.')
+    parser.add_argument('--processes', type=int, nargs='+',
+                        default=sorted({1, os.cpu_count()}))
+    parser.add_argument('--seconds', type=float, default=2.0,
+                        help='duração aproximada de cada medição')
+    parser.add_argument('--batch-size', type=int, default=1_000)
+    parser.add_argument('--wordlist',
+                        help='uma senha por linha (padrão: lista sintética)')
+    parser.add_argument('--mask', default='?l?l?l?l?d?d')
+    parser.add_argument('--iterations', type=int, default=600_000)
+    parser.add_argument('--scrypt-n', type=int, default=2**15)
+    parser.add_argument('--keyspace', type=int, default=62**8,
+                        help='espaço usado na estimativa de tempo '
+                             '(padrão: 8 alfanuméricos)')
+    config = parser.parse_args()
+
+    print(f"{'Formato':<18} {'Ataque':<20} {'Proc.':>5} {'tentativas':>11} "
+          f"{'tentativas/s':>13} {'por núcleo':>11} {'espaço (dias)':>14}")
+    for label, check in targets(config):
+        estimate = single_core_rate(check, min(config.seconds / 4, 0.5))
+        for name, candidates in attacks(config):
+            for processes in config.processes:
+                # Lotes menores para formatos lentos, senão um único lote
+                # passaria do orçamento e os núcleos ficariam ociosos.
+                batch_size = max(1, min(config.batch_size,
+                                        int(estimate * config.seconds / 8)))
+                budget = max(processes * batch_size,
+                             math.ceil(estimate * processes * config.seconds))
+                password, stats = attack(check, itertools.islice(candidates(), budget),
+                                         processes, batch_size)
+                assert password is None
+                days = config.keyspace / stats['rate'] / 86_400
+                print(f"{label:<18} {name:<20} {processes:>5} {stats['tested']:>11} "
+                      f"{stats['rate']:>13.0f} {stats['per_core']:>11.0f} {days:>14.2f}")
+
+    encoded = xor_encrypt(PASSWORD)
+    start = time.perf_counter()
+    assert xor_encrypt(solve(encoded, len(PASSWORD))) == encoded
+    print(f'xor_encrypt pela solução por pares: {time.perf_counter() - start:.6f}s '
+          f'para {len(PASSWORD)} caracteres, sem enumerar candidatos')
+    print(f'Máscara {config.mask}: {mask_size(config.mask)} candidatos')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import itertools
+from pathlib import Path
+import random
+import string
+import sys
+import time
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from cracking import count_solutions, iter_solutions
+from encrypt import xor_encrypt
+
+def brute_force_count(encoded, length, alphabet):
+    # Mesmo custo por candidato do xor_decrypt, mas percorrendo o espaço todo
+    # para contar todas as senhas equivalentes.
+    return sum(1 for candidate in itertools.product(alphabet, repeat=length)
+               if xor_encrypt(''.join(candidate)) == encoded)
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Força bruta contra a solução por pares do xor_encrypt.')
+    parser.add_argument('--lengths', type=int, nargs='+', default=[2, 3, 4, 8, 16, 64])
+    parser.add_argument('--max-brute', type=int, default=1_000_000,
+                        help='maior espaço de chaves percorrido de fato; acima dele o '
+                             'tempo é estimado pela vazão medida')
+    parser.add_argument('--seed', type=int, default=42)
+    config = parser.parse_args()
+
+    rng = random.Random(config.seed)
+    alphabet = string.printable
+    rate = None
+    print(f"{'n':>4} {'soluções':>12} {'força bruta (s)':>16} {'pares (ms)':>11} "
+          f"{'1ª solução (ms)':>16} {'ganho':>10}")
+    for length in config.lengths:
+        password = ''.join(rng.choice(alphabet) for _ in range(length))
+        encoded = xor_encrypt(password)
+        solutions, pruned = timed(count_solutions, encoded, length, alphabet)
+        _, first = timed(next, iter_solutions(encoded, length, alphabet))
+
+        keyspace = len(alphabet) ** length
+        if keyspace <= config.max_brute:
+            brute_solutions, brute = timed(brute_force_count, encoded, length, alphabet)
+            assert brute_solutions == solutions
+            rate = keyspace / brute
+            brute_label = f'{brute:.3f}'
+        else:
+            brute = keyspace / rate if rate else float('nan')
+            brute_label = f'~{brute:.3g}'
+        print(f"{length:>4} {solutions:>12.3g} {brute_label:>16} {pruned * 1e3:>11.3f} "
+              f"{first * 1e3:>16.3f} {brute / pruned:>9.3g}x")
+
+if __name__ == '__main__':
+    main()
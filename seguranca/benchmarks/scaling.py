@@ -0,0 +1,65 @@
+import argparse
+import base64
+import itertools
+import os
+from pathlib import Path
+import string
+import sys
+import time
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from cracking import crack
+from encrypt import xor_encrypt
+
+ALPHABETS = {
+    'printable': string.printable,
+    'lowercase': string.ascii_lowercase,
+    'alnum': string.ascii_letters + string.digits,
+}
+
+def unsolvable_target(length):
+    # Com comprimento ímpar o caractere do meio faz XOR consigo mesmo e dá 0;
+    # exigir 1 ali força a varredura do espaço de chaves inteiro.
+    return base64.b64encode((chr(1) * length).encode()).decode()
+
+def loop_rate(target, length, alphabet, samples):
+    start = time.perf_counter()
+    for candidate in itertools.islice(itertools.product(alphabet, repeat=length), samples):
+        if xor_encrypt(''.join(candidate)) == target:
+            break
+    return samples / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Escalabilidade da quebra paralela do xor_encrypt.')
+    parser.add_argument('--length', type=int, default=5, help='comprimento ímpar da senha')
+    parser.add_argument('--alphabet', choices=list(ALPHABETS), default='lowercase')
+    parser.add_argument('--processes', type=int, nargs='+',
+                        default=sorted({1, 2, 4, os.cpu_count()}))
+    parser.add_argument('--chunk-size', type=int, default=200_000)
+    parser.add_argument('--loop-samples', type=int, default=200_000)
+    config = parser.parse_args()
+    if config.length % 2 == 0:
+        parser.error('--length precisa ser ímpar')
+
+    alphabet = ALPHABETS[config.alphabet]
+    target = unsolvable_target(config.length)
+    keyspace = len(alphabet) ** config.length
+    baseline = loop_rate(target, config.length, alphabet, config.loop_samples)
+    print(f'Espaço de chaves: {keyspace} candidatos ({os.cpu_count()} núcleos)')
+    print(f'xor_decrypt original: {baseline:.0f} candidatos/s')
+    print(f"{'Processos':>9} {'Tempo (s)':>10} {'candidatos/s':>13} {'vs loop':>8} "
+          f"{'Eficiência':>11}")
+    single = None
+    for processes in config.processes:
+        password, stats = crack(target, config.length, alphabet, processes, config.chunk_size)
+        assert password is None and stats['tested'] == keyspace
+        if single is None:
+            single = stats['rate'] / processes
+        efficiency = stats['rate'] / (single * processes)
+        print(f"{processes:>9} {stats['elapsed']:>10.2f} {stats['rate']:>13.0f} "
+              f"{stats['rate'] / baseline:>7.1f}x {efficiency:>10.0%}")
+
+if __name__ == '__main__':
+    main()
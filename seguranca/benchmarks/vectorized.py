@@ -0,0 +1,69 @@
+import argparse
+import base64
+import itertools
+from pathlib import Path
+import string
+import sys
+import time
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import cracking
+from encrypt import xor_encrypt
+
+ALPHABETS = {
+    'printable': string.printable,
+    'lowercase': string.ascii_lowercase,
+}
+
+def loop_rate(encoded, length, alphabet, samples):
+    start = time.perf_counter()
+    for candidate in itertools.islice(itertools.product(alphabet, repeat=length), samples):
+        if xor_encrypt(''.join(candidate)) == encoded:
+            break
+    return samples / (time.perf_counter() - start)
+
+def chunk_rate(search, target, alphabet, length, suffix, chunks):
+    tested = 0
+    start = time.perf_counter()
+    for chunk in range(chunks):
+        tested += search(chunk, target, alphabet, length, suffix)[2]
+    return tested / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Candidatos por segundo: laço original, blocos em Python e NumPy.')
+    parser.add_argument('--length', type=int, default=7, help='comprimento ímpar')
+    parser.add_argument('--alphabet', choices=list(ALPHABETS), default='printable')
+    parser.add_argument('--chunk-sizes', type=int, nargs='+',
+                        default=[100, 10_000, 1_000_000])
+    parser.add_argument('--chunks', type=int, default=3, help='blocos medidos por tamanho')
+    parser.add_argument('--loop-samples', type=int, default=100_000)
+    config = parser.parse_args()
+    if config.length % 2 == 0:
+        parser.error('--length precisa ser ímpar')
+
+    alphabet = ALPHABETS[config.alphabet]
+    # Meio diferente de zero: nenhum candidato casa e todo bloco é varrido.
+    target = [1] * config.length
+    encoded = base64.b64encode(''.join(map(chr, target)).encode()).decode()
+    baseline = loop_rate(encoded, config.length, alphabet, config.loop_samples)
+    print(f'xor_decrypt original: {baseline:.0f} candidatos/s')
+    if cracking.numpy is None:
+        print('NumPy não instalado: só a avaliação em Python será medida.')
+
+    print(f"{'Bloco':>9} {'Python/s':>12} {'NumPy/s':>12} {'NumPy vs laço':>14}")
+    for chunk_size in config.chunk_sizes:
+        suffix, _ = cracking.plan(alphabet, config.length, chunk_size)
+        python_rate = chunk_rate(cracking.search_chunk, target, alphabet, config.length,
+                                 suffix, config.chunks)
+        numpy_rate = gain = '-'
+        if cracking.numpy is not None:
+            rate = chunk_rate(cracking.search_chunk_vectorized, target, alphabet,
+                              config.length, suffix, config.chunks)
+            numpy_rate, gain = f'{rate:.0f}', f'{rate / baseline:.1f}x'
+        print(f'{len(alphabet) ** suffix:>9} {python_rate:>12.0f} {numpy_rate:>12} '
+              f'{gain:>14}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,231 @@
+import base64
+import itertools
+import multiprocessing
+import os
+import queue
+import signal
+import string
+import time
+
+try:
+    import numpy
+except ImportError:  # a avaliação vetorizada é opcional
+    numpy = None
+
+# Blocos de trabalho: cada bloco fixa um prefixo da senha e percorre todas as
+# combinações das últimas posições. A numeração segue a ordem de
+# itertools.product, então o primeiro bloco com resposta contém exatamente a
+# senha que o xor_decrypt sequencial devolveria.
+
+def decode_target(encoded_password):
+    # Decodifica o base64 uma única vez; cada candidato é comparado direto
+    # com os códigos do XOR esperado.
+    return [ord(c) for c in base64.b64decode(encoded_password).decode()]
+
+def candidate_at(index, alphabet, length):
+    chars = []
+    for _ in range(length):
+        index, digit = divmod(index, len(alphabet))
+        chars.append(alphabet[digit])
+    return ''.join(reversed(chars))
+
+def plan(alphabet, length, chunk_size):
+    suffix = 0
+    while suffix < length and len(alphabet) ** (suffix + 1) <= chunk_size:
+        suffix += 1
+    return suffix, len(alphabet) ** (length - suffix)
+
+def search_chunk(chunk, target, alphabet, length, suffix, best=None):
+    codes = [ord(c) for c in alphabet]
+    prefix = tuple(ord(c) for c in candidate_at(chunk, alphabet, length - suffix))
+    pairs = [(i, length - 1 - i, target[i]) for i in range((length + 1) // 2)]
+    first, last, expected = pairs[0]
+    other_pairs = pairs[1:]
+    heads = [(code,) for code in codes] if suffix else [()]
+    tail_length = max(suffix - 1, 0)
+    tested = 0
+
+    for head in heads:
+        # Outro processo já achou a senha num bloco anterior: este é inútil.
+        if best is not None and best.value < chunk:
+            return chunk, None, tested
+        base = prefix + head
+        position = -1
+        for position, tail in enumerate(itertools.product(codes, repeat=tail_length)):
+            candidate = base + tail
+            if candidate[first] ^ candidate[last] != expected:
+                continue
+            if all(candidate[i] ^ candidate[j] == t for i, j, t in other_pairs):
+                password = ''.join(map(chr, candidate))
+                return chunk, password, tested + position + 1
+        tested += position + 1
+    return chunk, None, tested
+
+# Versão vetorizada: cada posição do sufixo vira uma coluna com um valor por
+# candidato do bloco, e cada par (i, n-1-i) é comparado de uma vez para
+# todos eles. As posições do prefixo são constantes no bloco.
+def search_chunk_vectorized(chunk, target, alphabet, length, suffix, best=None):
+    dtype = numpy.uint8 if max(map(ord, alphabet)) < 256 else numpy.uint32
+    codes = numpy.array([ord(c) for c in alphabet], dtype=dtype)
+    size = len(alphabet)
+    count = size ** suffix
+    columns = [ord(c) for c in candidate_at(chunk, alphabet, length - suffix)]
+    for k in range(suffix - 1, -1, -1):
+        columns.append(numpy.tile(numpy.repeat(codes, size ** k), size ** (suffix - 1 - k)))
+
+    matches = numpy.ones(count, dtype=bool)
+    for i in range((length + 1) // 2):
+        matches &= (columns[i] ^ columns[length - 1 - i]) == target[i]
+    hits = numpy.flatnonzero(matches)
+    if not len(hits):
+        return chunk, None, count
+    hit = int(hits[0])
+    return chunk, candidate_at(chunk * count + hit, alphabet, length), hit + 1
+
+_worker_state = None
+
+def _init_worker(best, target, alphabet, length, suffix, vectorized):
+    global _worker_state
+    # Ctrl-C interrompe só o processo principal, que encerra o pool.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker_state = (best, target, alphabet, length, suffix, vectorized)
+
+def _search(chunk):
+    best, target, alphabet, length, suffix, vectorized = _worker_state
+    search = search_chunk_vectorized if vectorized else search_chunk
+    return search(chunk, target, alphabet, length, suffix, best)
+
+def report_progress(stats):
+    print(f"{stats['chunks_done']}/{stats['chunks']} blocos, "
+          f"{stats['tested']} candidatos, {stats['rate']:.0f} candidatos/s", flush=True)
+
+def crack(encoded_password, length, alphabet=string.printable, processes=None,
+          chunk_size=200_000, progress=None, progress_interval=1.0, vectorized=None,
+          start_chunk=0):
+    if vectorized is None:
+        vectorized = numpy is not None
+    elif vectorized and numpy is None:
+        raise RuntimeError('A avaliação vetorizada precisa do NumPy instalado.')
+    search = search_chunk_vectorized if vectorized else search_chunk
+    target = decode_target(encoded_password)
+    suffix, chunks = plan(alphabet, length, chunk_size)
+    processes = processes or os.cpu_count()
+    # next_chunk: todos os blocos anteriores já foram percorridos; é o ponto
+    # de retomada de uma busca interrompida.
+    stats = {'tested': 0, 'chunks_done': 0, 'chunks': chunks, 'next_chunk': start_chunk,
+             'elapsed': 0.0, 'rate': 0.0, 'processes': processes,
+             'vectorized': vectorized}
+    if length == 0 or len(target) != length:
+        return None, stats
+
+    start = time.perf_counter()
+    last_report = start
+
+    def account(result, next_chunk):
+        nonlocal last_report
+        stats['next_chunk'] = next_chunk
+        stats['tested'] += result[2]
+        stats['chunks_done'] += 1
+        now = time.perf_counter()
+        stats['elapsed'] = now - start
+        stats['rate'] = stats['tested'] / stats['elapsed'] if stats['elapsed'] else 0.0
+        if progress is not None and now - last_report >= progress_interval:
+            last_report = now
+            progress(stats)
+
+    if processes == 1:
+        for chunk in range(start_chunk, chunks):
+            result = search(chunk, target, alphabet, length, suffix)
+            account(result, chunk + 1)
+            if result[1] is not None:
+                return result[1], stats
+        return None, stats
+
+    # Só há poucos blocos em voo por processo: o espaço de chaves pode ter
+    # bilhões de blocos e nada além do necessário é enfileirado. Depois que um
+    # bloco acha a senha, os posteriores deixam de ser enviados e os que já
+    # estão rodando desistem; os anteriores terminam para garantir a ordem.
+    best = multiprocessing.RawValue('q', chunks)
+    results = queue.Queue()
+    found = {}
+    finished = set()
+    lowest_pending = start_chunk
+    next_chunk = start_chunk
+    in_flight = 0
+    window = 4 * processes
+    with multiprocessing.Pool(processes, _init_worker,
+                              (best, target, alphabet, length, suffix,
+                               vectorized)) as pool:
+        while True:
+            while in_flight < window and next_chunk < min(chunks, best.value):
+                pool.apply_async(_search, (next_chunk,), callback=results.put,
+                                 error_callback=results.put)
+                next_chunk += 1
+                in_flight += 1
+            if not in_flight:
+                break
+            result = results.get()
+            in_flight -= 1
+            if isinstance(result, BaseException):
+                raise result
+            chunk, password, _ = result
+            if password is not None and chunk < best.value:
+                best.value = chunk
+                found[chunk] = password
+            finished.add(chunk)
+            while lowest_pending in finished:
+                finished.remove(lowest_pending)
+                lowest_pending += 1
+            account(result, lowest_pending)
+            if lowest_pending > best.value:
+                pool.terminate()
+                break
+    return found.get(best.value), stats
+
+# O xor_encrypt faz XOR da senha com o próprio reverso: a saída é simétrica e
+# a posição i só restringe o par (i, n-1-i). Cada par é resolvido sozinho, em
+# O(|alfabeto|), e as soluções são o produto das opções de cada par.
+def pair_options(encoded_password, length, alphabet=string.printable):
+    target = decode_target(encoded_password)
+    if length == 0 or len(target) != length:
+        return None
+    codes = {ord(c) for c in alphabet}
+    options = []
+    for i in range((length + 1) // 2):
+        expected = target[i]
+        if target[length - 1 - i] != expected:
+            return None
+        if i == length - 1 - i:
+            pairs = [(c, c) for c in alphabet] if expected == 0 else []
+        else:
+            pairs = [(c, chr(ord(c) ^ expected)) for c in alphabet
+                     if ord(c) ^ expected in codes]
+        if not pairs:
+            return None
+        options.append(pairs)
+    return options
+
+def count_solutions(encoded_password, length, alphabet=string.printable):
+    options = pair_options(encoded_password, length, alphabet)
+    if options is None:
+        return 0
+    total = 1
+    for pairs in options:
+        total *= len(pairs)
+    return total
+
+def iter_solutions(encoded_password, length, alphabet=string.printable):
+    # As opções de cada par seguem a ordem do alfabeto no primeiro caractere,
+    # então as soluções saem na mesma ordem em que o xor_decrypt as testaria.
+    options = pair_options(encoded_password, length, alphabet)
+    if options is None:
+        return
+    for choice in itertools.product(*options):
+        chars = [None] * length
+        for i, (first, second) in enumerate(choice):
+            chars[i] = first
+            chars[length - 1 - i] = second
+        yield ''.join(chars)
+
+def solve(encoded_password, length, alphabet=string.printable):
+    return next(iter_solutions(encoded_password, length, alphabet), None)
@@ -3,6 +3,8 @@ import time
 import itertools
 import string
 
+from cracking import count_solutions, solve
+
 def xor_encrypt(password):
     s1 = password
     s2 = password[::-1]
@@ -23,12 +25,14 @@ def main():
     print(f"Senha criptografada: {encrypted_password}")
     
     start_time = time.time()
-    cracked_password = xor_decrypt(encrypted_password, len(password))
+    cracked_password = solve(encrypted_password, len(password))
     end_time = time.time()
     
     if cracked_password:
         print(f"Senha quebrada: {cracked_password}")
         print(f"Tempo necessário: {end_time - start_time:.2f} segundos")
+        solutions = count_solutions(encrypted_password, len(password))
+        print(f"Senhas com a mesma criptografia: {solutions}")
     else:
         print("Falha ao quebrar a senha.")
 
@@ -0,0 +1,146 @@
+import argparse
+import json
+import os
+import string
+import time
+
+from cracking import crack, decode_target
+
+ALPHABETS = {
+    'printable': string.printable,
+    'lowercase': string.ascii_lowercase,
+    'uppercase': string.ascii_uppercase,
+    'digits': string.digits,
+    'letters': string.ascii_letters,
+    'alnum': string.ascii_letters + string.digits,
+}
+
+# Trabalho de quebra retomável. O estado (parâmetros, comprimento atual e
+# primeiro bloco ainda não percorrido) é gravado em JSON a cada intervalo e
+# ao receber Ctrl-C; rodar de novo com o mesmo arquivo continua dali. Como os
+# blocos são numerados de forma determinística, o bloco salvo identifica
+# exatamente o trecho do espaço de chaves que falta.
+
+def new_job(encoded_password, alphabet, min_length, max_length, chunk_size):
+    return {'encoded': encoded_password, 'alphabet': alphabet,
+            'min_length': min_length, 'max_length': max_length,
+            'chunk_size': chunk_size, 'length': min_length, 'next_chunk': 0,
+            'tested': 0, 'elapsed': 0.0, 'password': None, 'finished': False}
+
+def load_job(path):
+    with open(path) as checkpoint:
+        return json.load(checkpoint)
+
+def save_job(job, path):
+    temporary = path + '.tmp'
+    with open(temporary, 'w') as checkpoint:
+        json.dump(job, checkpoint)
+        checkpoint.flush()
+        os.fsync(checkpoint.fileno())
+    os.replace(temporary, path)
+
+def keyspace(job, length):
+    # O base64 revela o comprimento: outros comprimentos não têm candidatos.
+    if len(decode_target(job['encoded'])) != length:
+        return 0
+    return len(job['alphabet']) ** length
+
+def remaining(job, tested_in_length):
+    total = keyspace(job, job['length']) - tested_in_length
+    for length in range(job['length'] + 1, job['max_length'] + 1):
+        total += keyspace(job, length)
+    return max(total, 0)
+
+def format_duration(seconds):
+    if seconds == float('inf'):
+        return '?'
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    days, hours = divmod(hours, 24)
+    return (f'{days}d ' if days else '') + f'{hours:02d}:{minutes:02d}:{seconds:02d}'
+
+def run_job(job, path, processes=None, checkpoint_interval=30.0, progress_interval=1.0):
+    last_checkpoint = time.monotonic()
+    previous_tested = job['tested']
+    previous_elapsed = job['elapsed']
+
+    def progress(stats):
+        nonlocal last_checkpoint
+        job['next_chunk'] = stats['next_chunk']
+        job['tested'] = previous_tested + stats['tested']
+        job['elapsed'] = previous_elapsed + stats['elapsed']
+        per_chunk = keyspace(job, job['length']) // stats['chunks']
+        left = remaining(job, stats['next_chunk'] * per_chunk)
+        eta = left / stats['rate'] if stats['rate'] else float('inf')
+        print(f"n={job['length']} bloco {stats['next_chunk']}/{stats['chunks']}, "
+              f"{job['tested']} candidatos, {stats['rate']:.0f}/s, "
+              f"ETA {format_duration(eta)}", flush=True)
+        if time.monotonic() - last_checkpoint >= checkpoint_interval:
+            save_job(job, path)
+            last_checkpoint = time.monotonic()
+
+    try:
+        while not job['finished'] and job['length'] <= job['max_length']:
+            password, stats = crack(job['encoded'], job['length'], job['alphabet'],
+                                    processes, job['chunk_size'], progress,
+                                    progress_interval, start_chunk=job['next_chunk'])
+            job['tested'] = previous_tested + stats['tested']
+            job['elapsed'] = previous_elapsed + stats['elapsed']
+            previous_tested, previous_elapsed = job['tested'], job['elapsed']
+            if password is not None:
+                job['password'] = password
+                job['finished'] = True
+            else:
+                job['length'] += 1
+                job['next_chunk'] = 0
+            save_job(job, path)
+            last_checkpoint = time.monotonic()
+        job['finished'] = True
+        save_job(job, path)
+    except KeyboardInterrupt:
+        save_job(job, path)
+        print(f"\nInterrompido; retome com --checkpoint {path} "
+              f"(n={job['length']}, bloco {job['next_chunk']}).")
+        raise
+    return job
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Quebra retomável do xor_encrypt com checkpoints, progresso e ETA.')
+    parser.add_argument('--checkpoint', required=True,
+                        help='arquivo de estado; se existir, o trabalho é retomado')
+    parser.add_argument('--encoded', help='senha criptografada (base64)')
+    parser.add_argument('--alphabet', choices=list(ALPHABETS), default='printable')
+    parser.add_argument('--charset', help='alfabeto explícito (substitui --alphabet)')
+    parser.add_argument('--min-length', type=int, default=1)
+    parser.add_argument('--max-length', type=int, default=8)
+    parser.add_argument('--chunk-size', type=int, default=200_000)
+    parser.add_argument('--processes', type=int)
+    parser.add_argument('--checkpoint-interval', type=float, default=30.0)
+    options = parser.parse_args()
+
+    if os.path.exists(options.checkpoint):
+        job = load_job(options.checkpoint)
+        print(f"Retomando n={job['length']} a partir do bloco {job['next_chunk']} "
+              f"({job['tested']} candidatos já testados).")
+    elif options.encoded is None:
+        parser.error('--encoded é obrigatório para um trabalho novo')
+    else:
+        alphabet = options.charset or ALPHABETS[options.alphabet]
+        job = new_job(options.encoded, alphabet, options.min_length,
+                      options.max_length, options.chunk_size)
+        save_job(job, options.checkpoint)
+
+    try:
+        job = run_job(job, options.checkpoint, options.processes,
+                      options.checkpoint_interval)
+    except KeyboardInterrupt:
+        return
+    if job['password'] is not None:
+        print(f"Senha quebrada: {job['password']}")
+    else:
+        print('Falha ao quebrar a senha.')
+    print(f"{job['tested']} candidatos em {format_duration(job['elapsed'])}")
+
+if __name__ == '__main__':
+    main()